@@ -3,12 +3,22 @@
 SN Corporate Rating Model V2 – package entrypoint.
 """
 
-from .datamodel import QuantInputs, QualInputs, RatingOutputs
+from .datamodel import (
+    QuantArrays,
+    QuantInputs,
+    QuantResult,
+    QualInputs,
+    QualResult,
+    RatingOutputs,
+)
 from .model import RatingModel
 
 __all__ = [
     "QuantInputs",
+    "QuantArrays",
+    "QuantResult",
     "QualInputs",
+    "QualResult",
     "RatingOutputs",
     "RatingModel",
 ]
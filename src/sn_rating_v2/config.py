@@ -1,6 +1,6 @@
 # SN Corporate Rating Model V2 package
 import math
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 # Map ratios to conceptual families
 RATIO_FAMILY = {
@@ -23,6 +23,28 @@ RATIO_FAMILY = {
     "altman_z": "altman",
 }
 
+# Buckets always reported in bucket_avgs, in this order; other families
+# appear after them only when an issuer has a scored ratio in them
+BUCKET_FAMILIES: Tuple[str, ...] = (
+    "leverage",
+    "leverage_rev",
+    "coverage",
+    "profit",
+    "other",
+    "altman",
+)
+
+# Altman Z component keys, in the column order used by array layouts
+ALTMAN_COMPONENTS: Tuple[str, ...] = (
+    "working_capital",
+    "retained_earnings",
+    "ebit",
+    "sales",
+    "market_value_equity",
+    "total_assets",
+    "total_liabilities",
+)
+
 # Numerical score → rating grade cutoffs
 SCORE_TO_RATING: List[Tuple[float, str]] = [
     (95, "AAA"),
@@ -71,150 +93,156 @@ DISTRESS_TRIGGERS = {
     "altman_z": 1.81,
 }
 
-DISTRESS_BANDS = {
-    "interest_coverage": [
+DISTRESS_BANDS: Dict[str, Tuple[Tuple[float, int], ...]] = {
+    "interest_coverage": (
         (0.5, -4),
         (0.8, -3),
         (1.0, -2),
-    ],
-    "dscr": [
+    ),
+    "dscr": (
         (0.8, -3),
         (0.9, -2),
         (1.0, -1),
-    ],
-    "altman_z": [
+    ),
+    "altman_z": (
         (1.2, -4),
         (1.5, -3),
         (1.81, -2),
-    ],
+    ),
 }
 
 MAX_DISTRESS_NOTCHES = -4  # floor for cumulative distress notches
 
+# Metrics checked against DISTRESS_BANDS, in notching order
+DISTRESS_METRICS: Tuple[str, ...] = ("interest_coverage", "dscr", "altman_z")
+
 # Ratio grids: (low, high, score)
-RATIO_GRIDS: Dict[str, List[Tuple[float, float, float]]] = {
-    "debt_ebitda": [
+# Grids are immutable tuples; tune a ratio by assigning a new grid.
+RATIO_GRIDS: Dict[str, Tuple[Tuple[float, float, float], ...]] = {
+    "debt_ebitda": (
         (float("-inf"), 2.0, 100),
         (2.0, 3.0, 75),
         (3.0, 4.0, 50),
         (4.0, 6.0, 25),
         (6.0, float("inf"), 0),
-    ],
-    "net_debt_ebitda": [
+    ),
+    "net_debt_ebitda": (
         (float("-inf"), 1.5, 100),
         (1.5, 3.0, 75),
         (3.0, 4.5, 50),
         (4.5, 6.0, 25),
         (6.0, float("inf"), 0),
-    ],
-    "ffo_debt": [
+    ),
+    "ffo_debt": (
         (0.40, float("inf"), 100),
         (0.25, 0.40, 75),
         (0.12, 0.25, 50),
         (0.0, 0.12, 25),
         (float("-inf"), 0.0, 0),
-    ],
-    "fcf_debt": [
+    ),
+    "fcf_debt": (
         (0.20, float("inf"), 100),
         (0.10, 0.20, 75),
         (0.0, 0.10, 50),
         (-0.10, 0.0, 25),
         (float("-inf"), -0.10, 0),
-    ],
-    "debt_equity": [
+    ),
+    "debt_equity": (
         (float("-inf"), 0.5, 100),
         (0.5, 1.0, 75),
         (1.0, 2.0, 50),
         (2.0, 4.0, 25),
         (4.0, float("inf"), 0),
-    ],
-    "debt_capital": [
+    ),
+    "debt_capital": (
         (float("-inf"), 0.20, 100),
         (0.20, 0.35, 75),
         (0.35, 0.50, 50),
         (0.50, 0.70, 25),
         (0.70, float("inf"), 0),
-    ],
-    "interest_coverage": [
+    ),
+    "interest_coverage": (
         (8.0, float("inf"), 100),
         (5.0, 8.0, 75),
         (3.0, 5.0, 50),
         (1.5, 3.0, 25),
         (float("-inf"), 1.5, 0),
-    ],
-    "fixed_charge_coverage": [
+    ),
+    "fixed_charge_coverage": (
         (6.0, float("inf"), 100),
         (4.0, 6.0, 75),
         (2.5, 4.0, 50),
         (1.5, 2.5, 25),
         (float("-inf"), 1.5, 0),
-    ],
-    "dscr": [
+    ),
+    "dscr": (
         (2.0, float("inf"), 100),
         (1.5, 2.0, 75),
         (1.2, 1.5, 50),
         (1.0, 1.2, 25),
         (float("-inf"), 1.0, 0),
-    ],
-    "ebitda_margin": [
+    ),
+    "ebitda_margin": (
         (0.25, float("inf"), 100),
         (0.15, 0.25, 75),
         (0.10, 0.15, 50),
         (0.05, 0.10, 25),
         (float("-inf"), 0.05, 0),
-    ],
-    "ebit_margin": [
+    ),
+    "ebit_margin": (
         (0.15, float("inf"), 100),
         (0.10, 0.15, 75),
         (0.05, 0.10, 50),
         (0.0, 0.05, 25),
         (float("-inf"), 0.0, 0),
-    ],
-    "roa": [
+    ),
+    "roa": (
         (0.12, float("inf"), 100),
         (0.08, 0.12, 75),
         (0.04, 0.08, 50),
         (0.0, 0.04, 25),
         (float("-inf"), 0.0, 0),
-    ],
-    "roe": [
+    ),
+    "roe": (
         (0.20, float("inf"), 100),
         (0.12, 0.20, 75),
         (0.05, 0.12, 50),
         (0.0, 0.05, 25),
         (float("-inf"), 0.0, 0),
-    ],
-    "capex_dep": [
-        (1.2, 1.8, 100),
+    ),
+    # U-shaped scores, but contiguous non-overlapping bands in ascending order,
+    # so it bisects like every other grid
+    "capex_dep": (
+        (float("-inf"), 0.5, 0),
+        (0.5, 0.7, 25),
+        (0.7, 0.9, 50),
         (0.9, 1.2, 75),
+        (1.2, 1.8, 100),
         (1.8, 2.5, 75),
-        (0.7, 0.9, 50),
         (2.5, 3.5, 50),
-        (0.5, 0.7, 25),
         (3.5, float("inf"), 25),
-        (float("-inf"), 0.5, 0),
-    ],
-    "current_ratio": [
+    ),
+    "current_ratio": (
         (2.0, float("inf"), 100),
         (1.5, 2.0, 75),
         (1.0, 1.5, 50),
         (0.7, 1.0, 25),
         (float("-inf"), 0.7, 0),
-    ],
-    "rollover_coverage": [
+    ),
+    "rollover_coverage": (
         (2.0, float("inf"), 100),
         (1.2, 2.0, 75),
         (0.8, 1.2, 50),
         (0.5, 0.8, 25),
         (float("-inf"), 0.5, 0),
-    ],
-    "altman_z": [
+    ),
+    "altman_z": (
         (3.0, float("inf"), 100),
         (2.7, 3.0, 75),
         (1.8, 2.7, 50),
         (1.5, 1.8, 25),
         (float("-inf"), 1.5, 0),
-    ],
+    ),
 }
 
 # Qualitative 1–5 scale → score
@@ -225,3 +253,382 @@ QUAL_SCORE_SCALE: Dict[int, float] = {
     2: 25.0,
     1: 0.0,
 }
+
+
+# ---------------------------------------------------------------------------
+# Derived lookup tables
+#
+# Every table the scoring hot paths need is built once, up front, into TABLES
+# and read from there with no staleness checks. The tunable tables above are
+# notifying containers: editing one in place (RATIO_GRIDS["x"] = ...,
+# SCORE_TO_RATING.clear(), RATING_SCALE[:] = ...) rebuilds the tables derived
+# from it. Rebinding a module global (config.RATIO_GRIDS = {...}) or editing a
+# grid or band list nested inside a table is not seen; call refresh_tables()
+# afterwards.
+# ---------------------------------------------------------------------------
+
+
+class _Tables:
+    __slots__ = (
+        "ratio_cuts",
+        "ratio_scan",
+        "ratio_scorer",
+        "rating_scale",
+        "rating_index",
+        "score_cutoffs",
+        "rating_bands",
+        "band_outlooks",
+        "ratio_order",
+        "ratio_index",
+        "family_index",
+        "ratio_slots",
+        "qual_lut",
+        "distress_cuts",
+        "distress_spec",
+        "altman_bands",
+    )
+
+
+TABLES = _Tables()
+
+
+def _build_ratio_cuts(
+    grid: Sequence[Tuple[float, float, float]],
+) -> Optional[Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[float, ...]]]:
+    bands = sorted(grid, key=lambda band: band[0])
+    for (_, high, _), (next_low, _, _) in zip(bands, bands[1:]):
+        if high > next_low:
+            return None  # overlapping bands: keep first-match list scan
+    lows = tuple(float(low) for low, _, _ in bands)
+    highs = tuple(float(high) for _, high, _ in bands)
+    scores = tuple(float(score) for _, _, score in bands)
+    return lows, highs, scores
+
+
+def _refresh_ratio_grids() -> None:
+    cuts = {}
+    scan = {}
+    for name, grid in RATIO_GRIDS.items():
+        if not grid:
+            continue  # never scored
+        built = _build_ratio_cuts(grid)
+        if built is None:
+            scan[name] = tuple(grid)
+        else:
+            cuts[name] = built
+    TABLES.ratio_cuts = cuts
+    TABLES.ratio_scan = scan
+    TABLES.ratio_scorer = _build_ratio_scorer(RATIO_GRIDS)
+
+
+def _refresh_rating_scale() -> None:
+    scale = tuple(RATING_SCALE)
+    # the scale and its index are always replaced together
+    TABLES.rating_scale = scale
+    TABLES.rating_index = {grade: i for i, grade in reversed(list(enumerate(scale)))}
+
+
+def _build_rating_bands(
+    table: Sequence[Tuple[float, str]],
+) -> Dict[str, Tuple[float, float]]:
+    bands: Dict[str, Tuple[float, float]] = {}
+    for i, (cutoff, grade) in enumerate(table):
+        band_max = 100.0 if i == 0 else table[i - 1][0] - 1.0
+        bands.setdefault(grade, (cutoff, band_max))
+    return bands
+
+
+def _refresh_score_to_rating() -> None:
+    table = tuple(SCORE_TO_RATING)
+    TABLES.score_cutoffs = (
+        tuple(float(cutoff) for cutoff, _ in reversed(table)),
+        tuple(grade for _, grade in reversed(table)),
+    )
+    bands = _build_rating_bands(table)
+    TABLES.rating_bands = bands
+    # band_max wins when a band is a single point, as in the band-edge checks
+    TABLES.band_outlooks = {
+        grade: {band_min: "Negative", band_max: "Positive"}
+        for grade, (band_min, band_max) in bands.items()
+    }
+
+
+def _refresh_ratio_family() -> None:
+    family = dict(RATIO_FAMILY)
+    index = {name: i for i, name in enumerate(BUCKET_FAMILIES)}
+    for name in family.values():
+        index.setdefault(name, len(index))
+    TABLES.ratio_order = tuple(family)
+    TABLES.ratio_index = {name: i for i, name in enumerate(family)}
+    TABLES.family_index = index
+    TABLES.ratio_slots = {name: index[fam] for name, fam in family.items()}
+
+
+def _refresh_qual_score_scale() -> None:
+    scale = dict(QUAL_SCORE_SCALE)
+    size = max((k for k in scale if k >= 0), default=-1) + 1
+    TABLES.qual_lut = tuple(scale.get(i) for i in range(size))
+
+
+def _refresh_distress_bands() -> None:
+    cuts = {}
+    for metric, bands in DISTRESS_BANDS.items():
+        if not bands:
+            continue
+        ordered = sorted(bands, key=lambda band: band[0])
+        cuts[metric] = (
+            tuple(float(threshold) for threshold, _ in ordered),
+            tuple(notches for _, notches in ordered),
+        )
+    TABLES.distress_cuts = cuts
+    # Band lists are a handful of entries, so the notching loop scans them in
+    # listed order (first value < threshold wins); Altman Z is always present
+    # and kept apart from the metrics read out of fin.
+    spec = {
+        metric: tuple((float(threshold), notches) for threshold, notches in bands)
+        for metric, bands in DISTRESS_BANDS.items()
+        if bands and metric in DISTRESS_METRICS
+    }
+    TABLES.altman_bands = spec.pop("altman_z", ())
+    TABLES.distress_spec = tuple(
+        (metric, spec[metric]) for metric in DISTRESS_METRICS if metric in spec
+    )
+
+
+def _float_literal(x: float) -> str:
+    # 1e999 parses to inf, so the generated source needs no global lookups
+    if math.isinf(x):
+        return "1e999" if x > 0 else "-1e999"
+    return repr(float(x))
+
+
+def _grid_chain(
+    grid: Sequence[Tuple[float, float, float]], indent: str, action: str
+) -> List[str]:
+    lines = []
+    for branch, (low, high, score) in enumerate(grid):
+        cond = f"v < {_float_literal(high)}"
+        if low != float("-inf"):
+            cond = f"{_float_literal(low)} <= {cond}"
+        kw = "if" if branch == 0 else "elif"
+        lines.append(f"{indent}{kw} {cond}:")
+        lines.append(f"{indent}    {action.format(_float_literal(score))}")
+    return lines
+
+
+def _build_ratio_scorer(
+    grids: Dict[str, Sequence[Tuple[float, float, float]]],
+) -> Callable[[Dict[str, float]], Dict[str, Optional[float]]]:
+    # Each grid becomes an if/elif chain twice: inlined into one straight-line
+    # function for fins carrying many grids, and as its own function for
+    # sparse fins, which then only pay for the ratios they carry.
+    dense = [
+        "def score_dense(fin):",
+        "    out = dict.fromkeys(fin)",
+        "    get = fin.get",
+    ]
+    single = []
+    functions: Dict[str, str] = {}
+    for i, (name, grid) in enumerate(grids.items()):
+        if not grid:
+            continue
+        key = repr(name)
+        dense.append(f"    v = get({key})")
+        dense.append("    if v is not None and v == v:")
+        dense.extend(_grid_chain(grid, "        ", f"out[{key}] = {{}}"))
+        functions[name] = f"score_{i}"
+        single.append(f"def score_{i}(v):")
+        single.extend(_grid_chain(grid, "    ", "return {}"))
+        single.append("    return None  # gaps and NaN fail every comparison")
+    dense.append("    return out")
+    ns: Dict[str, Any] = {}
+    source = "\n".join(dense + single)
+    exec(compile(source, "<sn_rating_v2.ratio_scorer>", "exec"), ns)
+    score_dense = ns["score_dense"]
+    get = {name: ns[function] for name, function in functions.items()}.get
+    sparse_limit = len(functions) // 3  # measured crossover of the two paths
+
+    def score_all(fin: Dict[str, float]) -> Dict[str, Optional[float]]:
+        if len(fin) > sparse_limit:
+            return score_dense(fin)
+        out = dict.fromkeys(fin)
+        for name, v in fin.items():
+            scorer = get(name)
+            if scorer is not None and v is not None:
+                out[name] = scorer(v)
+        return out
+
+    return score_all
+
+
+# source table name → rebuild of the tables derived from it
+_REFRESH: Dict[str, Callable[[], None]] = {
+    "RATIO_GRIDS": _refresh_ratio_grids,
+    "RATING_SCALE": _refresh_rating_scale,
+    "SCORE_TO_RATING": _refresh_score_to_rating,
+    "RATIO_FAMILY": _refresh_ratio_family,
+    "QUAL_SCORE_SCALE": _refresh_qual_score_scale,
+    "DISTRESS_BANDS": _refresh_distress_bands,
+}
+
+
+def refresh_tables() -> None:
+    """Rebuild every derived table from the current config globals."""
+    for refresh in _REFRESH.values():
+        refresh()
+
+
+def _notifying(method: Callable[..., Any]) -> Callable[..., Any]:
+    def mutator(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        _REFRESH[self._source]()
+        return result
+
+    mutator.__name__ = method.__name__
+    return mutator
+
+
+class _TunableDict(dict):
+    """dict that rebuilds the derived tables of its config entry when edited."""
+
+    __slots__ = ("_source",)
+
+    def __init__(self, source: str, data: Dict[Any, Any]) -> None:
+        super().__init__(data)
+        self._source = source
+
+    def __reduce__(self):
+        # copies and pickles are plain dicts, detached from the config
+        return (dict, (dict(self),))
+
+    __setitem__ = _notifying(dict.__setitem__)
+    __delitem__ = _notifying(dict.__delitem__)
+    __ior__ = _notifying(dict.__ior__)
+    clear = _notifying(dict.clear)
+    pop = _notifying(dict.pop)
+    popitem = _notifying(dict.popitem)
+    setdefault = _notifying(dict.setdefault)
+    update = _notifying(dict.update)
+
+
+class _TunableList(list):
+    """list that rebuilds the derived tables of its config entry when edited."""
+
+    __slots__ = ("_source",)
+
+    def __init__(self, source: str, data: List[Any]) -> None:
+        super().__init__(data)
+        self._source = source
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    __setitem__ = _notifying(list.__setitem__)
+    __delitem__ = _notifying(list.__delitem__)
+    __iadd__ = _notifying(list.__iadd__)
+    __imul__ = _notifying(list.__imul__)
+    append = _notifying(list.append)
+    extend = _notifying(list.extend)
+    insert = _notifying(list.insert)
+    pop = _notifying(list.pop)
+    remove = _notifying(list.remove)
+    clear = _notifying(list.clear)
+    sort = _notifying(list.sort)
+    reverse = _notifying(list.reverse)
+
+
+RATIO_FAMILY = _TunableDict("RATIO_FAMILY", RATIO_FAMILY)
+SCORE_TO_RATING = _TunableList("SCORE_TO_RATING", SCORE_TO_RATING)
+RATING_SCALE = _TunableList("RATING_SCALE", RATING_SCALE)
+DISTRESS_BANDS = _TunableDict("DISTRESS_BANDS", DISTRESS_BANDS)
+RATIO_GRIDS = _TunableDict("RATIO_GRIDS", RATIO_GRIDS)
+QUAL_SCORE_SCALE = _TunableDict("QUAL_SCORE_SCALE", QUAL_SCORE_SCALE)
+
+
+# Accessors for the derived tables (no per-call checks; see TABLES)
+
+
+def ratio_cuts(
+    name: str,
+) -> Optional[Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[float, ...]]]:
+    """
+    Sorted (lows, highs, scores) for RATIO_GRIDS[name], for use with
+    bisect_right on lows. None if the grid is missing, empty or overlapping.
+    """
+    return TABLES.ratio_cuts.get(name)
+
+
+def rating_index() -> Dict[str, int]:
+    """Grade → position in RATING_SCALE (0 = best); see TABLES.rating_scale."""
+    return TABLES.rating_index
+
+
+def score_cutoffs() -> Tuple[Tuple[float, ...], Tuple[str, ...]]:
+    """Ascending SCORE_TO_RATING cutoffs with parallel grades, for bisect_right."""
+    return TABLES.score_cutoffs
+
+
+def rating_bands() -> Dict[str, Tuple[float, float]]:
+    """Grade → inclusive score band (band_min, band_max) from SCORE_TO_RATING."""
+    return TABLES.rating_bands
+
+
+def band_outlooks() -> Dict[str, Dict[float, str]]:
+    """Grade → {band_max: "Positive", band_min: "Negative"} from rating_bands()."""
+    return TABLES.band_outlooks
+
+
+def ratio_order() -> Tuple[str, ...]:
+    """Ratio names in RATIO_FAMILY order; the column layout of QuantArrays."""
+    return TABLES.ratio_order
+
+
+def ratio_index() -> Dict[str, int]:
+    """Ratio name → column in ratio_order()."""
+    return TABLES.ratio_index
+
+
+def family_index() -> Dict[str, int]:
+    """Family → bucket slot: BUCKET_FAMILIES first, then other RATIO_FAMILY values."""
+    return TABLES.family_index
+
+
+def ratio_slots() -> Dict[str, int]:
+    """Ratio name → bucket slot of its family in family_index()."""
+    return TABLES.ratio_slots
+
+
+def qual_lut() -> Tuple[Optional[float], ...]:
+    """QUAL_SCORE_SCALE as a tuple indexed by the 1–5 value (None = unscored)."""
+    return TABLES.qual_lut
+
+
+def ratio_scorer() -> Callable[[Dict[str, float]], Dict[str, Optional[float]]]:
+    """
+    Straight-line scorer generated from RATIO_GRIDS.
+
+    score_all(fin) returns {name: score or None} for every key of fin. Each
+    grid is inlined as its own if/elif chain in grid order (first match
+    wins, exactly as score_ratio) and only the grids named in fin are run.
+    Regenerated whenever RATIO_GRIDS is refreshed.
+    """
+    return TABLES.ratio_scorer
+
+
+def distress_cuts(metric: str) -> Optional[Tuple[Tuple[float, ...], Tuple[int, ...]]]:
+    """
+    Ascending DISTRESS_BANDS[metric] thresholds with parallel notches.
+
+    A band applies when value < threshold, so the band for a value is
+    bisect_right(thresholds, value); an index equal to len(thresholds)
+    means no band applies. None if the metric has no bands.
+    """
+    return TABLES.distress_cuts.get(metric)
+
+
+def distress_spec() -> Tuple[Tuple[str, Tuple[Tuple[float, int], ...]], ...]:
+    """(metric, bands) for the DISTRESS_METRICS read from fin, Altman Z excluded."""
+    return TABLES.distress_spec
+
+
+refresh_tables()
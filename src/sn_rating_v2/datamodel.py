@@ -1,9 +1,13 @@
 # SN Corporate Rating Model V2 package
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
 
+from .config import ALTMAN_COMPONENTS, ratio_order
+from .helpers import compute_peer_means
 
-@dataclass
+
+@dataclass(slots=True)
 class QuantInputs:
     fin_t0: Dict[str, float]  # current period
     fin_t1: Dict[str, float]  # previous period
@@ -11,16 +15,84 @@ class QuantInputs:
     components_t0: Dict[str, float]
     components_t1: Dict[str, float]
     components_t2: Dict[str, float]
-    peers_t0: Dict[str, List[float]]
+    peers_t0: Dict[str, Sequence[float]]  # stored as array('d') per ratio
+    # derived from peers_t0 at construction; rebuild the inputs if peers change
+    peer_means: Dict[str, float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # unboxed float64 storage; the caller's dict and lists are not modified
+        self.peers_t0 = {
+            rname: array("d", vals) for rname, vals in self.peers_t0.items()
+        }
+        self.peer_means = compute_peer_means(self.peers_t0)
+
+
+@dataclass(slots=True)
+class QuantArrays:
+    """
+    Structure-of-arrays view of QuantInputs for batch and compiled scoring.
+
+    fin[p][j] is ratio names[j] in period p (0 = t0), components[p] follows
+    ALTMAN_COMPONENTS and peer_means[j] is the t0 peer average; missing
+    values are NaN.
+    """
+
+    names: Tuple[str, ...]
+    fin: Tuple[array, array, array]
+    components: Tuple[array, array, array]
+    peer_means: array
+
+    @classmethod
+    def from_inputs(cls, q: QuantInputs) -> "QuantArrays":
+        names = ratio_order()
+        nan = float("nan")
+
+        def row(values: Dict[str, float], keys: Tuple[str, ...]) -> array:
+            out = array("d")
+            for key in keys:
+                v = values.get(key)
+                out.append(nan if v is None else v)
+            return out
 
+        peer_means = row(q.peer_means, names)
 
-@dataclass
+        return cls(
+            names=names,
+            fin=(
+                row(q.fin_t0, names),
+                row(q.fin_t1, names),
+                row(q.fin_t2, names),
+            ),
+            components=(
+                row(q.components_t0, ALTMAN_COMPONENTS),
+                row(q.components_t1, ALTMAN_COMPONENTS),
+                row(q.components_t2, ALTMAN_COMPONENTS),
+            ),
+            peer_means=peer_means,
+        )
+
+
+@dataclass(slots=True)
 class QualInputs:
     factors_t0: Dict[str, int]  # 1–5 values
     factors_t1: Dict[str, int]
 
 
-@dataclass
+# Intermediate results; NamedTuples so existing tuple unpacking keeps working
+class QuantResult(NamedTuple):
+    quant_score: float
+    peer_score: Optional[float]
+    bucket_avgs: Dict[str, float]
+    altman_z: float
+    n_quant: int  # scored ratios, plus one if peer positioning was scored
+
+
+class QualResult(NamedTuple):
+    qual_score: float
+    n_qual: int
+
+
+@dataclass(slots=True)
 class RatingOutputs:
     issuer_name: str
     quantitative_score: float
@@ -41,4 +113,4 @@ class RatingOutputs:
     bucket_avgs: Dict[str, float]
     altman_z_t0: float
     flags: Dict[str, bool]
-    rating_explanation: str
+    rating_explanation: Optional[str]  # None when computed with explain=False
@@ -0,0 +1,262 @@
+# SN Corporate Rating Model V2 package
+"""
+Optional compiled kernels for batch (portfolio) scoring.
+
+The kernels are compiled with numba when it is installed. Without numba the
+same functions run as plain Python, so results never depend on numba being
+available. The single-issuer RatingModel path does not use this module;
+RatingModel.compute_quantitative_batch uses altman_z_batch.
+"""
+
+import math
+from array import array
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from .config import (
+    ALTMAN_COMPONENTS,
+    DISTRESS_METRICS,
+    MAX_DISTRESS_NOTCHES,
+    RATIO_FAMILY,
+    RATIO_GRIDS,
+    distress_cuts,
+    ratio_cuts,
+)
+from .datamodel import QuantArrays
+from .helpers import compute_altman_z_batch
+
+try:
+    from numba import njit, prange
+
+    _NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # no-op stand-in supporting both @njit and @njit(...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+    prange = range
+
+
+@njit(cache=True)
+def altman_z_nb(wc, ta, re, ebit, mve, tl, s):
+    if ta == 0.0 or tl == 0.0:
+        return math.nan
+    return 1.2 * (wc / ta) + 1.4 * (re / ta) + 3.3 * (ebit / ta) + 0.6 * (mve / tl) + 1.0 * (s / ta)
+
+
+@njit(cache=True, parallel=True)
+def altman_z_columns_nb(wc, re, ebit, s, mve, ta, tl, out):
+    # one column per component, in ALTMAN_COMPONENTS order; one issuer per lane
+    for k in prange(len(out)):
+        out[k] = altman_z_nb(wc[k], ta[k], re[k], ebit[k], mve[k], tl[k], s[k])
+
+
+@njit(cache=True)
+def score_grid_nb(value, lows, highs, scores, start, stop):
+    # bisect_right over lows[start:stop]; NaN when the value is not scored
+    if value != value:
+        return math.nan
+    lo = start
+    hi = stop
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if value < lows[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    i = lo - 1
+    if i >= start and value < highs[i]:
+        return scores[i]
+    return math.nan
+
+
+@njit(cache=True, parallel=True)
+def batch_score_nb(values, n_ratios, offsets, lows, highs, scores, out_score, out_count):
+    # values is row-major (n_issuers, n_ratios); one issuer per parallel lane
+    for k in prange(len(out_score)):
+        total = 0.0
+        n = 0
+        for r in range(n_ratios):
+            s = score_grid_nb(
+                values[k * n_ratios + r], lows, highs, scores, offsets[r], offsets[r + 1]
+            )
+            if s == s:
+                total += s
+                n += 1
+        out_score[k] = total / n if n else 0.0
+        out_count[k] = n
+
+
+@njit(cache=True)
+def score_and_distress_nb(
+    values, offsets, lows, highs, scores,
+    dist_values, dist_offsets, dist_cuts, dist_notches, max_notches,
+):
+    # grid average over values plus cumulative distress notches for one issuer
+    total = 0.0
+    n = 0
+    for r in range(len(offsets) - 1):
+        s = score_grid_nb(values[r], lows, highs, scores, offsets[r], offsets[r + 1])
+        if s == s:
+            total += s
+            n += 1
+    notches = 0
+    for m in range(len(dist_offsets) - 1):
+        v = dist_values[m]
+        if v != v:
+            continue  # missing metric
+        start = dist_offsets[m]
+        stop = dist_offsets[m + 1]
+        lo = start
+        hi = stop
+        while lo < hi:  # bisect_right: first threshold > v
+            mid = (lo + hi) // 2
+            if v < dist_cuts[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo < stop:
+            notches += dist_notches[lo]
+    if notches < max_notches:
+        notches = max_notches
+    return (total / n if n else 0.0), n, notches
+
+
+def altman_z_batch(components_list: Sequence[Mapping[str, float]]) -> List[float]:
+    """
+    helpers.compute_altman_z_batch through the compiled column kernel.
+
+    Without numba the per-dict helper is faster than packing columns, so
+    it is used directly; both give identical results.
+    """
+    if not _NUMBA_AVAILABLE:
+        return compute_altman_z_batch(components_list)
+    columns = [array("d", [c[key] for c in components_list]) for key in ALTMAN_COMPONENTS]
+    out = array("d", [0.0]) * len(components_list)
+    altman_z_columns_nb(*columns, out)
+    return list(out)
+
+
+def flat_grids(names: Sequence[str]) -> Tuple[array, array, array, array]:
+    """
+    Pack the bisect tables for names into flat (offsets, lows, highs, scores)
+    arrays; ratio r owns bands offsets[r]:offsets[r + 1]. Missing or
+    overlapping grids get no bands, so their values are never scored.
+    """
+    offsets = array("q", [0])
+    lows = array("d")
+    highs = array("d")
+    scores = array("d")
+    for name in names:
+        cuts = ratio_cuts(name)
+        if cuts is not None:
+            lows.extend(cuts[0])
+            highs.extend(cuts[1])
+            scores.extend(cuts[2])
+        offsets.append(len(lows))
+    return offsets, lows, highs, scores
+
+
+def batch_score(
+    fins: Sequence[Mapping[str, float]],
+    names: Optional[Sequence[str]] = None,
+) -> Tuple[List[float], List[int]]:
+    """
+    Average grid score and number of scored ratios for each issuer in fins.
+
+    names defaults to every ratio in RATIO_FAMILY that has a grid. Peer
+    positioning and Altman Z from components are not included here.
+    """
+    if names is None:
+        names = [name for name in RATIO_FAMILY if name in RATIO_GRIDS]
+    offsets, lows, highs, scores = flat_grids(names)
+    nan = math.nan
+    values = array("d")
+    for fin in fins:
+        for name in names:
+            v = fin.get(name)
+            values.append(nan if v is None else v)
+    out_score = array("d", [0.0]) * len(fins)
+    out_count = array("q", [0]) * len(fins)
+    batch_score_nb(values, len(names), offsets, lows, highs, scores, out_score, out_count)
+    return list(out_score), list(out_count)
+
+
+def batch_score_arrays(
+    arrays: Sequence[QuantArrays],
+    period: int = 0,
+) -> Tuple[List[float], List[int]]:
+    """batch_score over prebuilt QuantArrays rows; no per-key dict access."""
+    if not arrays:
+        return [], []
+    names = arrays[0].names
+    values = array("d")
+    for a in arrays:
+        if a.names != names:
+            raise ValueError("QuantArrays built with different ratio layouts")
+        values.extend(a.fin[period])
+    offsets, lows, highs, scores = flat_grids(names)
+    out_score = array("d", [0.0]) * len(arrays)
+    out_count = array("q", [0]) * len(arrays)
+    batch_score_nb(values, len(names), offsets, lows, highs, scores, out_score, out_count)
+    return list(out_score), list(out_count)
+
+
+def flat_distress_bands(
+    metrics: Sequence[str] = DISTRESS_METRICS,
+) -> Tuple[array, array, array]:
+    """Pack config.distress_cuts() for metrics into flat (offsets, cuts, notches)."""
+    offsets = array("q", [0])
+    cuts = array("d")
+    notches = array("q")
+    for metric in metrics:
+        table = distress_cuts(metric)
+        if table is not None:
+            cuts.extend(table[0])
+            notches.extend(table[1])
+        offsets.append(len(cuts))
+    return offsets, cuts, notches
+
+
+def score_and_distress(arrays: QuantArrays, altman_z: float) -> Tuple[float, int, int]:
+    """
+    (grid average, scored ratio count, distress notches) for one issuer in a
+    single compiled call. altman_z fills the altman_z column when present;
+    peer positioning is not included.
+    """
+    index = {name: i for i, name in enumerate(arrays.names)}
+    values = array("d", arrays.fin[0])
+    if "altman_z" in index:
+        values[index["altman_z"]] = altman_z
+    nan = math.nan
+    dist_values = array(
+        "d",
+        [
+            altman_z if metric == "altman_z" else (values[index[metric]] if metric in index else nan)
+            for metric in DISTRESS_METRICS
+        ],
+    )
+    offsets, lows, highs, scores = flat_grids(arrays.names)
+    dist_offsets, dist_cuts, dist_notches = flat_distress_bands()
+    return score_and_distress_nb(
+        values, offsets, lows, highs, scores,
+        dist_values, dist_offsets, dist_cuts, dist_notches, MAX_DISTRESS_NOTCHES,
+    )
+
+
+def _warmup() -> None:
+    # trigger compilation on tiny inputs so the first real batch is not slowed
+    one = array("d", [1.0])
+    edges = array("q", [0, 1])
+    score_grid_nb(1.0, one, one, one, 0, 1)
+    altman_z_nb(1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
+    altman_z_columns_nb(one, one, one, one, one, one, one, array("d", [0.0]))
+    batch_score_nb(one, 1, edges, one, one, one, array("d", [0.0]), array("q", [0]))
+    score_and_distress_nb(one, edges, one, one, one, one, edges, one, array("q", [0]), -4)
+
+
+if _NUMBA_AVAILABLE:
+    _warmup()
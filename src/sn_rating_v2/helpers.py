@@ -2,32 +2,75 @@
 
 import logging
 import math
-from statistics import mean
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .config import (
-    RATIO_GRIDS,
+    TABLES,
     QUAL_SCORE_SCALE,
-    SCORE_TO_RATING,
-    RATING_SCALE,
     RATING_WEIGHTS,
     DISTRESS_BANDS,
     MAX_DISTRESS_NOTCHES,
+    band_outlooks,
+    rating_bands,
+    score_cutoffs,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def score_ratio(name: str, value: float) -> Optional[float]:
-    grid = RATIO_GRIDS.get(name)
-    if not grid or value is None or math.isnan(value):
+    # value != value is True only for NaN
+    if value is None or value != value:
+        return None
+    cuts = TABLES.ratio_cuts.get(name)
+    if cuts is None:
+        # missing or empty grid, or overlapping bands: first match in grid order
+        for low, high, score in TABLES.ratio_scan.get(name, ()):
+            if low <= value < high:
+                return float(score)
         return None
-    for low, high, score in grid:
-        if low <= value < high:
-            return float(score)
+    lows, highs, scores = cuts
+    i = bisect_right(lows, value) - 1
+    if i >= 0 and value < highs[i]:
+        return scores[i]
     return None
 
 
+def score_ratios_batch(fin: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """Score every ratio in fin in one pass; same result as score_ratio per key."""
+    return TABLES.ratio_scorer(fin)
+
+
+def score_ratio_column(
+    name: str,
+    values: Sequence[Optional[float]],
+) -> List[Optional[float]]:
+    """score_ratio for one ratio over many values (e.g. one per issuer)."""
+    cuts = TABLES.ratio_cuts.get(name)
+    if cuts is None:
+        # missing or overlapping grid
+        return [score_ratio(name, v) for v in values]
+    lows, highs, scores = cuts
+    out: List[Optional[float]] = []
+    append = out.append
+    for v in values:
+        if v is None or v != v:
+            append(None)
+            continue
+        i = bisect_right(lows, v) - 1
+        append(scores[i] if i >= 0 and v < highs[i] else None)
+    return out
+
+
 def score_qual_factor_numeric(value: int) -> Optional[float]:
-    return QUAL_SCORE_SCALE.get(int(value))
+    i = int(value)
+    lut = TABLES.qual_lut
+    if 0 <= i < len(lut):
+        return lut[i]
+    # the table runs up to the largest key, so only negative keys can still score
+    return QUAL_SCORE_SCALE.get(i) if i < 0 else None
 
 
 def compute_altman_z_from_components(
@@ -49,58 +92,106 @@ def compute_altman_z_from_components(
     return 1.2 * A + 1.4 * B + 3.3 * C + 0.6 * D + 1.0 * E
 
 
+def compute_altman_z_batch(components_list: List[Dict[str, float]]) -> List[float]:
+    """Altman Z for several component dicts (e.g. t0, t1, t2) in one pass."""
+    nan = float("nan")
+    out: List[float] = []
+    for c in components_list:
+        total_assets = c["total_assets"]
+        total_liabilities = c["total_liabilities"]
+        if total_assets == 0 or total_liabilities == 0:
+            out.append(nan)
+            continue
+        out.append(
+            1.2 * (c["working_capital"] / total_assets)
+            + 1.4 * (c["retained_earnings"] / total_assets)
+            + 3.3 * (c["ebit"] / total_assets)
+            + 0.6 * (c["market_value_equity"] / total_liabilities)
+            + 1.0 * (c["sales"] / total_assets)
+        )
+    return out
+
+
+# under-performance share ladder: share <= cut → score
+_PEER_SHARE_CUTS = (0.10, 0.30, 0.60, 0.80)
+_PEER_SHARE_SCORES = (100.0, 75.0, 50.0, 25.0, 0.0)
+
+
+def compute_peer_means(peers: Dict[str, Sequence[float]]) -> Dict[str, float]:
+    """Average of each non-empty peer list."""
+    return {rname: sum(vals) / len(vals) for rname, vals in peers.items() if vals}
+
+
 def compute_peer_score(
     fin_current: Dict[str, float],
-    peers: Dict[str, List[float]],
+    peers: Dict[str, Sequence[float]],
+    peer_means: Optional[Dict[str, float]] = None,
 ) -> Optional[float]:
-    under = 0
-    total = 0
-    for rname, peer_vals in peers.items():
-        if rname not in fin_current or not peer_vals:
-            continue
-        cp = fin_current[rname]
-        peer_avg = mean(peer_vals)
-        if peer_avg == 0:
-            continue
-        total += 1
-        if cp < peer_avg * 0.9:
-            under += 1
-    if total == 0:
-        return None
-    under_share = under / total
-    if under_share <= 0.10:
-        return 100.0
-    elif under_share <= 0.30:
-        return 75.0
-    elif under_share <= 0.60:
-        return 50.0
-    elif under_share <= 0.80:
-        return 25.0
-    else:
-        return 0.0
+    # peer_means, if given, must be compute_peer_means(peers) (e.g. QuantInputs.peer_means)
+    if peer_means is None:
+        peer_means = compute_peer_means(peers)
+    return compute_peer_score_batch([fin_current], peer_means)[0]
+
+
+def compute_peer_score_batch(
+    fins: Sequence[Dict[str, float]],
+    peer_means: Dict[str, float],
+) -> List[Optional[float]]:
+    """
+    compute_peer_score for many issuers benchmarked against the same peer
+    means; the under-performance bars are derived once for the whole batch.
+    """
+    bars = [
+        (rname, peer_avg * 0.9) for rname, peer_avg in peer_means.items() if peer_avg != 0
+    ]
+    scores: List[Optional[float]] = []
+    for fin in fins:
+        total = under = 0
+        for rname, bar in bars:
+            if rname in fin:
+                total += 1
+                if fin[rname] < bar:
+                    under += 1
+        if total == 0:
+            scores.append(None)
+        else:
+            scores.append(_PEER_SHARE_SCORES[bisect_left(_PEER_SHARE_CUTS, under / total)])
+    return scores
 
 
 def score_to_rating(score: float) -> str:
-    for cutoff, grade in SCORE_TO_RATING:
-        if score >= cutoff:
-            return grade
-    raise ValueError(f"Score {score} did not match any cutoff")
+    cutoffs, grades = score_cutoffs()
+    i = bisect_right(cutoffs, score) - 1
+    if i < 0 or math.isnan(score):
+        raise ValueError(f"Score {score} did not match any cutoff")
+    return grades[i]
 
 
 def safe_score_to_rating(score: float) -> str:
-    try:
-        return score_to_rating(score)
-    except ValueError as e:
-        logging.error("Score-to-rating mapping failed: %s", e)
+    cutoffs, grades = score_cutoffs()
+    # validate once up front; `not >=` also rejects NaN
+    if not cutoffs or not score >= cutoffs[0]:
+        logger.error(
+            "Score-to-rating mapping failed: Score %s did not match any cutoff", score
+        )
         return "N/R"
+    return grades[bisect_right(cutoffs, score) - 1]
 
 
 def move_notches(grade: str, notches: int) -> str:
-    if grade not in RATING_SCALE:
+    tables = TABLES  # scale and index are always read from the same refresh
+    idx = tables.rating_index.get(grade, -1)
+    if idx < 0:
         return grade
-    idx = RATING_SCALE.index(grade)
-    new_idx = max(0, min(idx - notches, len(RATING_SCALE) - 1))
-    return RATING_SCALE[new_idx]
+    scale = tables.rating_scale
+    new_idx = idx - notches
+    if new_idx < 0:
+        new_idx = 0
+    else:
+        last = len(scale) - 1
+        if new_idx > last:
+            new_idx = last
+    return scale[new_idx]
 
 
 def apply_sovereign_cap(
@@ -109,11 +200,13 @@ def apply_sovereign_cap(
 ) -> str:
     if sovereign_grade is None:
         return issuer_grade
-    if issuer_grade not in RATING_SCALE or sovereign_grade not in RATING_SCALE:
+    tables = TABLES
+    index = tables.rating_index
+    i = index.get(issuer_grade, -1)
+    s = index.get(sovereign_grade, -1)
+    if i < 0 or s < 0:
         return issuer_grade
-    i = RATING_SCALE.index(issuer_grade)
-    s = RATING_SCALE.index(sovereign_grade)
-    return RATING_SCALE[max(i, s)]
+    return tables.rating_scale[max(i, s)]
 
 
 def compute_effective_weights(n_quant: int, n_qual: int) -> Tuple[float, float]:
@@ -126,9 +219,20 @@ def compute_effective_weights(n_quant: int, n_qual: int) -> Tuple[float, float]:
        quantitative and qualitative items.
     3) If there are no active items at all, return (0.0, 0.0).
     """
-    wq_cfg = RATING_WEIGHTS["quantitative"]
-    wl_cfg = RATING_WEIGHTS["qualitative"]
-
+    return _effective_weights(
+        n_quant, n_qual, RATING_WEIGHTS["quantitative"], RATING_WEIGHTS["qualitative"]
+    )
+
+
+@lru_cache(maxsize=256)
+def _effective_weights(
+    n_quant: int,
+    n_qual: int,
+    wq_cfg: Optional[float],
+    wl_cfg: Optional[float],
+) -> Tuple[float, float]:
+    # keyed on the configured weights too, so RATING_WEIGHTS edits take effect;
+    # batches repeat a handful of (n_quant, n_qual) shapes (see cache_info())
     if wq_cfg is not None and wl_cfg is not None:
         return float(wq_cfg), float(wl_cfg)
 
@@ -146,28 +250,22 @@ def compute_effective_weights(n_quant: int, n_qual: int) -> Tuple[float, float]:
 
 def get_rating_band(rating: str) -> Tuple[float, float]:
     # returns inclusive score band [min, max] that maps to rating
-    for i, (cutoff, grade) in enumerate(SCORE_TO_RATING):
-        if grade == rating:
-            band_min = cutoff
-            if i == 0:
-                band_max = 100.0
-            else:
-                prev_cutoff, _ = SCORE_TO_RATING[i - 1]
-                band_max = prev_cutoff - 1.0
-            return band_min, band_max
-    raise ValueError(f"Unknown rating grade: {rating!r}")
+    try:
+        return rating_bands()[rating]
+    except KeyError:
+        raise ValueError(f"Unknown rating grade: {rating!r}") from None
 
 
 def derive_outlook_band_only(combined_score: float, rating: str) -> str:
     """Band-based outlook on the base rating, using floored score."""
-    band_min, band_max = get_rating_band(rating)
-    cs = math.floor(combined_score)
-    if cs == band_max:
-        return "Positive"
-    elif cs == band_min:
-        return "Negative"
-    else:
-        return "Stable"
+    try:
+        edges = band_outlooks()[rating]
+    except KeyError:
+        raise ValueError(f"Unknown rating grade: {rating!r}") from None
+    return edges.get(math.floor(combined_score), "Stable")
+
+
+_DISTRESS_TREND_RATIOS = ("interest_coverage", "dscr", "altman_z")
 
 
 def derive_outlook_with_distress_trend(
@@ -180,23 +278,16 @@ def derive_outlook_with_distress_trend(
     if distress_notches >= 0:
         return base_outlook
 
-    ratios = ["interest_coverage", "dscr", "altman_z"]
-    improving = False
     deteriorating = False
-
-    for r in ratios:
+    for r in _DISTRESS_TREND_RATIOS:
         v0 = fin_t0.get(r)
         v1 = fin_t1.get(r)
         if v0 is None or v1 is None:
             continue
-        # higher is better
+        # higher is better; one improving ratio already settles on Stable
         if v0 > v1:
-            improving = True
-        elif v0 < v1:
+            return "Stable"
+        if v0 < v1:
             deteriorating = True
 
-    if improving and not deteriorating:
-        return "Stable"
-    if deteriorating and not improving:
-        return "Negative"
-    return "Stable"
+    return "Negative" if deteriorating else "Stable"
@@ -1,34 +1,203 @@
 # SN Corporate Rating Model V2 package
 
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, product, repeat
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .config import (
+    BUCKET_FAMILIES,
     RATIO_FAMILY,
-    DISTRESS_BANDS,
     MAX_DISTRESS_NOTCHES,
+    TABLES,
+    family_index,
+    ratio_slots,
 )
-from .datamodel import QuantInputs, QualInputs, RatingOutputs
+from .datamodel import QuantInputs, QuantResult, QualInputs, QualResult, RatingOutputs
+from .fastpath import altman_z_batch
 from .helpers import (
     compute_altman_z_from_components,
     compute_peer_score,
+    compute_peer_score_batch,
     score_ratio,
+    score_ratio_column,
+    score_ratios_batch,
     score_qual_factor_numeric,
     compute_effective_weights,
-    move_notches,
-    apply_sovereign_cap,
     derive_outlook_band_only,
     derive_outlook_with_distress_trend,
     safe_score_to_rating,
 )
 
+logger = logging.getLogger(__name__)
+_INFO = logging.INFO
+_DEBUG = logging.DEBUG
+
+_VALID_OUTLOOKS = frozenset({"Positive", "Stable", "Negative"})
+
+# Outlook when the sovereign cap binds, keyed by (base_outlook, sovereign_outlook):
+# a more optimistic model yields to the sovereign, either side Negative stays
+# Negative, anything else is Stable.
+_OUTLOOK_MERGE: Dict[Tuple[str, str], str] = {
+    ("Positive", "Positive"): "Stable",
+    ("Positive", "Stable"): "Stable",
+    ("Positive", "Negative"): "Negative",
+    ("Stable", "Positive"): "Stable",
+    ("Stable", "Stable"): "Stable",
+    ("Stable", "Negative"): "Negative",
+    ("Negative", "Positive"): "Negative",
+    ("Negative", "Stable"): "Negative",
+    ("Negative", "Negative"): "Negative",
+}
+
+
+class _ReadOnlyFlags(dict):
+    """RatingOutputs.flags: shared between outputs, so mutation is blocked."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("RatingOutputs.flags is shared and read-only; copy it with dict()")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # pickles (e.g. back from batch_compute workers) without __setitem__
+        return (_ReadOnlyFlags, (dict(self),))
+
+
+_FLAGS: Dict[Tuple[bool, bool, bool, bool], _ReadOnlyFlags] = {
+    key: _ReadOnlyFlags(
+        zip(
+            (
+                "enable_hardstops",
+                "enable_sovereign_cap",
+                "hardstop_triggered",
+                "sovereign_cap_binding",
+            ),
+            key,
+        )
+    )
+    for key in product((False, True), repeat=4)
+}
+
+# Outlook when the sovereign cap binds, keyed by (base_outlook, sovereign_outlook,
+# sovereign_cap_binding, aligned) where aligned means the cap did not move the
+# rating. Aligned issuers sharing the sovereign's outlook keep the model's
+# band-based outlook; every other binding case is merged via _OUTLOOK_MERGE.
+_OUTLOOK_TABLE: Dict[Tuple[str, str, bool, bool], str] = {
+    (base, sov, True, aligned): (
+        base if aligned and base == sov else _OUTLOOK_MERGE[base, sov]
+    )
+    for base in _VALID_OUTLOOKS
+    for sov in _VALID_OUTLOOKS
+    for aligned in (False, True)
+}
+
+# (quant_inputs, qual_inputs, sovereign_rating, sovereign_outlook)
+IssuerInputs = Tuple[QuantInputs, QualInputs, Optional[str], Optional[str]]
+
+
+def _quant_items(
+    fin: Dict[str, float],
+    altman_z: float,
+) -> Iterable[Tuple[str, float]]:
+    # fin items with altman_z filled in, in the order dict(fin, altman_z=z) would give
+    if fin.get("altman_z") is not None:
+        return fin.items()
+    if "altman_z" in fin:
+        return ((k, altman_z if k == "altman_z" else v) for k, v in fin.items())
+    return chain(fin.items(), (("altman_z", altman_z),))
+
+
+# Explanation sentences, assembled into one template per (hardstop, cap) case
+_EXPLAIN_CORE = (
+    "Based on the quantitative and qualitative factors, the combined score is "
+    "{out.combined_score:.1f}, corresponding to a base rating of {out.base_rating}."
+)
+_EXPLAIN_HARDSTOP = {
+    True: (
+        " Distress factors {factors} triggered a total "
+        "of {notches} notch(es) of downgrade, resulting in a "
+        "post-distress (hardstop) rating of {out.hardstop_rating}."
+    ),
+    False: (
+        " No distress-related hardstops were applied, so the hardstop rating "
+        "remains equal to the base rating at {out.hardstop_rating}."
+    ),
+}
+_EXPLAIN_CAP = {
+    # sovereign actively worsens the rating relative to hardstop
+    "capped": (
+        " The sovereign cap is binding: given the sovereign rating of "
+        "{out.sovereign_rating}, the rating is constrained from {out.hardstop_rating} "
+        "to a capped rating of {out.capped_rating}."
+    ),
+    # issuer is at sovereign level; cap is effectively binding at that level
+    "aligned": (
+        " The issuer's rating is aligned with the sovereign rating at "
+        "{out.sovereign_rating}, so the sovereign cap is effectively binding."
+    ),
+    # cap present but not constraining
+    "not_binding": (
+        " A sovereign rating of {out.sovereign_rating} is considered, but it does not "
+        "constrain the issuer rating, so the capped rating remains {out.capped_rating}."
+    ),
+    # no cap applied
+    "none": (
+        " No sovereign cap is applied, so the capped rating is the same as the "
+        "post-distress rating at {out.capped_rating}."
+    ),
+}
+_EXPLAIN_FINAL = (
+    " The final issuer rating is {out.final_rating} with an outlook of {out.outlook}."
+)
+
+_EXPLANATION_TEMPLATES: Dict[Tuple[bool, str], str] = {
+    (hardstop, cap): _EXPLAIN_CORE + hardstop_text + cap_text + _EXPLAIN_FINAL
+    for hardstop, hardstop_text in _EXPLAIN_HARDSTOP.items()
+    for cap, cap_text in _EXPLAIN_CAP.items()
+}
+
+
+def explain_rating(out: RatingOutputs) -> str:
+    """
+    Narrative rating explanation built from the fields of a RatingOutputs.
+
+    compute_final_rating(explain=False) leaves rating_explanation as None;
+    call this to produce the same text on demand.
+    """
+    if not out.flags["enable_sovereign_cap"]:
+        cap = "none"
+    elif not out.sovereign_cap_binding:
+        cap = "not_binding"
+    elif out.hardstop_rating != out.capped_rating:
+        cap = "capped"
+    else:
+        cap = "aligned"
+    return _EXPLANATION_TEMPLATES[bool(out.hardstop_triggered), cap].format(
+        out=out,
+        factors=list(out.hardstop_details.keys()),
+        notches=abs(out.distress_notches),
+    )
+
+
+def _peer_fin(q: QuantInputs, altman_z: float) -> Dict[str, float]:
+    # fin_t0 as benchmarked against peers; computed Z only matters if peers have one
+    fin = q.fin_t0
+    if "altman_z" in q.peer_means and fin.get("altman_z") is None:
+        return {**fin, "altman_z": altman_z}
+    return fin
+
 
 class RatingModel:
     def __init__(self, cp_name: str):
         self.cp_name = cp_name
 
     def _ensure_altman_z(self, fin: Dict[str, float], comps: Dict[str, float]) -> float:
-        # compute Altman Z if not already present
+        # Altman Z from fin if present, else from components; fin is not modified
         if "altman_z" in fin and fin["altman_z"] is not None:
             return fin["altman_z"]
         z = compute_altman_z_from_components(
@@ -40,95 +209,181 @@ class RatingModel:
             comps["total_liabilities"],
             comps["sales"],
         )
-        fin["altman_z"] = z
-        logging.info("%s-AltmanZ: computed z=%.3f from components", self.cp_name, z)
+        if logger.isEnabledFor(_INFO):
+            logger.info("%s-AltmanZ: computed z=%.3f from components", self.cp_name, z)
         return z
 
     def compute_quantitative(
         self,
         q: QuantInputs,
-    ) -> Tuple[float, Optional[float], Dict[str, float], float, int]:
-        fin = dict(q.fin_t0)  # copy to avoid mutating caller
+    ) -> QuantResult:
+        fin = q.fin_t0  # read-only; the computed Z is passed alongside
         altman_z = self._ensure_altman_z(fin, q.components_t0)
+        ratio_scores = score_ratios_batch(fin)
+        if fin.get("altman_z") is None:
+            ratio_scores["altman_z"] = score_ratio("altman_z", altman_z)
+        # skip peer positioning outright on the common no-peers path
+        peer_score = (
+            compute_peer_score(_peer_fin(q, altman_z), q.peers_t0, q.peer_means)
+            if q.peer_means
+            else None
+        )
+        return self._aggregate_quantitative(q, ratio_scores, altman_z, peer_score)
 
-        scores: List[float] = []
-        bucket_scores: Dict[str, List[float]] = {
-            "leverage": [],
-            "leverage_rev": [],
-            "coverage": [],
-            "profit": [],
-            "other": [],
-            "altman": [],
+    def compute_quantitative_batch(
+        self,
+        quants: Sequence[QuantInputs],
+    ) -> List[QuantResult]:
+        """
+        compute_quantitative for many issuers. Each ratio is scored across all
+        issuers in one score_ratio_column call and missing Altman Z values
+        are computed in one fastpath.altman_z_batch pass.
+        """
+        quants = list(quants)
+        zs = [q.fin_t0.get("altman_z") for q in quants]
+
+        missing = [i for i, z in enumerate(zs) if z is None]
+        computed = altman_z_batch([quants[i].components_t0 for i in missing])
+        info = logger.isEnabledFor(_INFO)
+        for i, z in zip(missing, computed):
+            zs[i] = z
+            if info:
+                logger.info("%s-AltmanZ: computed z=%.3f from components", self.cp_name, z)
+
+        columns: Dict[str, List[float]] = {}
+        family = RATIO_FAMILY  # locals for the per-issuer, per-ratio loop
+        column = columns.setdefault
+        for q, z in zip(quants, zs):
+            for rname, val in _quant_items(q.fin_t0, z):
+                if rname in family:
+                    column(rname, []).append(val)
+        # one iterator per ratio, consumed in issuer order below
+        scored = {
+            rname: iter(score_ratio_column(rname, vals)) for rname, vals in columns.items()
         }
 
+        # peer positioning once per distinct peer set (portfolios often share one)
+        peer_scores: List[Optional[float]] = [None] * len(quants)
+        peer_groups: Dict[Tuple[Tuple[str, float], ...], List[int]] = {}
+        for i, q in enumerate(quants):
+            if q.peer_means:
+                peer_groups.setdefault(tuple(q.peer_means.items()), []).append(i)
+        for members in peer_groups.values():
+            peer_means = quants[members[0]].peer_means
+            fins = [_peer_fin(quants[i], zs[i]) for i in members]
+            for i, ps in zip(members, compute_peer_score_batch(fins, peer_means)):
+                peer_scores[i] = ps
+
+        results = []
+        aggregate = self._aggregate_quantitative
+        for q, z, ps in zip(quants, zs, peer_scores):
+            ratio_scores = {
+                rname: next(scored[rname])
+                for rname, _ in _quant_items(q.fin_t0, z)
+                if rname in scored
+            }
+            results.append(aggregate(q, ratio_scores, z, ps))
+        return results
+
+    def _aggregate_quantitative(
+        self,
+        q: QuantInputs,
+        ratio_scores: Dict[str, Optional[float]],
+        altman_z: float,
+        peer_score: Optional[float],
+    ) -> QuantResult:
+        # ratio_scores covers every RATIO_FAMILY key of _quant_items(q.fin_t0, altman_z)
+        fin = q.fin_t0
+        slots = family_index()
+        # running per-bucket sums and counts, indexed by bucket slot
+        bucket_sum = [0.0] * len(slots)
+        bucket_n = [0] * len(slots)
+
+        total_score = 0.0
         n_quant_items = 0
-
-        for rname, val in fin.items():
-            if rname not in RATIO_FAMILY:
-                continue
-            s = score_ratio(rname, val)
+        slot_of = ratio_slots().get
+        debug = logger.isEnabledFor(_DEBUG)  # per-ratio traces fire per issuer
+
+        for rname, val in _quant_items(fin, altman_z):
+            slot = slot_of(rname)
+            if slot is None:
+                continue  # not in RATIO_FAMILY
+            s = ratio_scores[rname]
             if s is None:
-                logging.info("%s-Quant: no grid/score for ratio %s", self.cp_name, rname)
+                if debug:
+                    logger.debug("%s-Quant: no grid/score for ratio %s", self.cp_name, rname)
                 continue
-            scores.append(s)
+            total_score += s
             n_quant_items += 1
-            family = RATIO_FAMILY[rname]
-            bucket_scores.setdefault(family, []).append(s)
-            logging.info(
-                "%s-Quant: %s value=%.3f score=%.1f family=%s",
-                self.cp_name,
-                rname,
-                val,
-                s,
-                family,
-            )
+            bucket_sum[slot] += s
+            bucket_n[slot] += 1
+            if debug:
+                logger.debug(
+                    "%s-Quant: %s value=%.3f score=%.1f family=%s",
+                    self.cp_name,
+                    rname,
+                    val,
+                    s,
+                    RATIO_FAMILY[rname],
+                )
 
-        peer_score = compute_peer_score(fin, q.peers_t0)
         if peer_score is not None:
-            scores.append(peer_score)
+            total_score += peer_score
             n_quant_items += 1
-            bucket_scores["other"].append(peer_score)
-            logging.info("%s-PeerPositioning: score=%.1f", self.cp_name, peer_score)
+            slot = slots["other"]
+            bucket_sum[slot] += peer_score
+            bucket_n[slot] += 1
+            if logger.isEnabledFor(_INFO):
+                logger.info("%s-PeerPositioning: score=%.1f", self.cp_name, peer_score)
 
-        quantitative_score = sum(scores) / len(scores) if scores else 0.0
-        logging.info("%s-Quant: aggregate score=%.1f", self.cp_name, quantitative_score)
+        quantitative_score = total_score / n_quant_items if n_quant_items else 0.0
+        if logger.isEnabledFor(_INFO):
+            logger.info("%s-Quant: aggregate score=%.1f", self.cp_name, quantitative_score)
 
+        n_fixed = len(BUCKET_FAMILIES)
         bucket_avgs = {
-            b: round(sum(vals) / len(vals), 1) if vals else 0.0
-            for b, vals in bucket_scores.items()
+            b: round(bucket_sum[i] / bucket_n[i], 1) if bucket_n[i] else 0.0
+            for b, i in slots.items()
+            if i < n_fixed or bucket_n[i]
         }
 
-        return quantitative_score, peer_score, bucket_avgs, altman_z, n_quant_items
+        return QuantResult(quantitative_score, peer_score, bucket_avgs, altman_z, n_quant_items)
 
-    def compute_qualitative(self, ql: QualInputs) -> Tuple[float, int]:
+    def compute_qualitative(self, ql: QualInputs) -> QualResult:
         scores: List[float] = []
         n_qual_items = 0
+        debug = logger.isEnabledFor(_DEBUG)  # per-factor traces fire per issuer
+        score_factor = score_qual_factor_numeric  # locals for the per-factor loop
+        append = scores.append
         for name, val in ql.factors_t0.items():
-            s = score_qual_factor_numeric(val)
+            s = score_factor(val)
             if s is None:
-                logging.info(
-                    "%s-Qual: unknown or out-of-range factor %s=%s",
+                if debug:
+                    logger.debug(
+                        "%s-Qual: unknown or out-of-range factor %s=%s",
+                        self.cp_name,
+                        name,
+                        val,
+                    )
+                continue
+            append(s)
+            n_qual_items += 1
+            if debug:
+                logger.debug(
+                    "%s-Qual: %s=%s score=%.1f",
                     self.cp_name,
                     name,
                     val,
+                    s,
                 )
-                continue
-            scores.append(s)
-            n_qual_items += 1
-            logging.info(
-                "%s-Qual: %s=%s score=%.1f",
+        qualitative_score = sum(scores) / len(scores) if scores else 0.0
+        if logger.isEnabledFor(_INFO):
+            logger.info(
+                "%s-Qual: aggregate score=%.1f",
                 self.cp_name,
-                name,
-                val,
-                s,
+                qualitative_score,
             )
-        qualitative_score = sum(scores) / len(scores) if scores else 0.0
-        logging.info(
-            "%s-Qual: aggregate score=%.1f",
-            self.cp_name,
-            qualitative_score,
-        )
-        return qualitative_score, n_qual_items
+        return QualResult(qualitative_score, n_qual_items)
 
     def compute_distress_notches(
         self,
@@ -138,23 +393,18 @@ class RatingModel:
         total_notches = 0
         details: Dict[str, float] = {}
 
-        ic = fin.get("interest_coverage")
-        if ic is not None:
-            for threshold, notches in DISTRESS_BANDS["interest_coverage"]:
-                if ic < threshold:
-                    total_notches += notches
-                    details["interest_coverage"] = ic
-                    break
-
-        dscr = fin.get("dscr")
-        if dscr is not None:
-            for threshold, notches in DISTRESS_BANDS["dscr"]:
-                if dscr < threshold:
+        for metric, bands in TABLES.distress_spec:
+            value = fin.get(metric)
+            if value is None:
+                continue
+            for threshold, notches in bands:
+                if value < threshold:
                     total_notches += notches
-                    details["dscr"] = dscr
+                    details[metric] = value
                     break
 
-        for threshold, notches in DISTRESS_BANDS["altman_z"]:
+        # Altman Z is always supplied (given or computed from components)
+        for threshold, notches in TABLES.altman_bands:
             if altman_z < threshold:
                 total_notches += notches
                 details["altman_z"] = altman_z
@@ -173,23 +423,83 @@ class RatingModel:
         sovereign_outlook: Optional[str] = None,
         enable_hardstops: bool = False,
         enable_sovereign_cap: bool = False,
+        explain: bool = True,
     ) -> RatingOutputs:
         # 1) Quantitative and qualitative scores
-        quant_score, peer_score, bucket_avgs, altman_z, n_quant = self.compute_quantitative(
-            quant_inputs
+        return self._assemble(
+            quant_inputs,
+            self.compute_quantitative(quant_inputs),
+            self.compute_qualitative(qual_inputs),
+            sovereign_rating,
+            sovereign_outlook,
+            enable_hardstops,
+            enable_sovereign_cap,
+            explain,
         )
-        qual_score, n_qual = self.compute_qualitative(qual_inputs)
+
+    def rate_many(
+        self,
+        issuers: Iterable[IssuerInputs],
+        enable_hardstops: bool = False,
+        enable_sovereign_cap: bool = False,
+        explain: bool = False,
+    ) -> List[RatingOutputs]:
+        """
+        compute_final_rating for many issuers in one process.
+
+        Quantitative scores come from compute_quantitative_batch (ratios
+        scored column-wise, missing Altman Z computed in one pass); only
+        the per-issuer rating/outlook assembly loops over issuers. Outputs
+        match compute_final_rating, except that rating_explanation is None
+        unless explain=True.
+        """
+        issuers = list(issuers)
+        quant_results = self.compute_quantitative_batch([quant for quant, _, _, _ in issuers])
+        return [
+            self._assemble(
+                quant,
+                quant_result,
+                self.compute_qualitative(qual),
+                sovereign_rating,
+                sovereign_outlook,
+                enable_hardstops,
+                enable_sovereign_cap,
+                explain,
+            )
+            for (quant, qual, sovereign_rating, sovereign_outlook), quant_result in zip(
+                issuers, quant_results
+            )
+        ]
+
+    def _assemble(
+        self,
+        quant_inputs: QuantInputs,
+        quant_result: QuantResult,
+        qual_result: QualResult,
+        sovereign_rating: Optional[str],
+        sovereign_outlook: Optional[str],
+        enable_hardstops: bool,
+        enable_sovereign_cap: bool,
+        explain: bool,
+    ) -> RatingOutputs:
+        # steps 2) onwards of compute_final_rating, shared with rate_many
+        quant_score = quant_result.quant_score
+        altman_z = quant_result.altman_z
+        qual_score = qual_result.qual_score
+        n_quant = quant_result.n_quant
+        n_qual = qual_result.n_qual
 
         # 2) Effective weights
         wq, wl = compute_effective_weights(n_quant, n_qual)
-        logging.info(
-            "%s-Weights: n_quant=%d n_qual=%d -> wq=%.3f wl=%.3f",
-            self.cp_name,
-            n_quant,
-            n_qual,
-            wq,
-            wl,
-        )
+        if logger.isEnabledFor(_INFO):
+            logger.info(
+                "%s-Weights: n_quant=%d n_qual=%d -> wq=%.3f wl=%.3f",
+                self.cp_name,
+                n_quant,
+                n_qual,
+                wq,
+                wl,
+            )
 
         combined_score = wq * quant_score + wl * qual_score  # weighted average
 
@@ -206,55 +516,50 @@ class RatingModel:
             distress_notches = 0
             hardstop_details = {}
 
-        hardstop_rating = move_notches(base_rating, distress_notches)
         hardstop_triggered = distress_notches < 0
-
-        # 5) Sovereign cap application
-        capped_rating = hardstop_rating
-        if enable_sovereign_cap and sovereign_rating is not None:
-            capped_rating = apply_sovereign_cap(hardstop_rating, sovereign_rating)
+        cap_active = enable_sovereign_cap and sovereign_rating is not None
+
+        # Notching and capping work on RATING_SCALE positions (0 = best);
+        # grades are resolved once here and looked up once at the end.
+        tables = TABLES  # scale and index are always read from the same refresh
+        index = tables.rating_index
+        base_idx = index.get(base_rating, -1)
+        sov_idx = index.get(sovereign_rating, -1) if cap_active else -1
+        if base_idx < 0:
+            # off-scale base (e.g. N/R): passes through notching and cap unchanged
+            hardstop_idx = capped_idx = -1
+            hardstop_rating = capped_rating = base_rating
+        else:
+            scale = tables.rating_scale
+            last = len(scale) - 1
+            hardstop_idx = min(max(base_idx - distress_notches, 0), last)
+            # 5) Sovereign cap application: issuer can be no better than sovereign
+            capped_idx = sov_idx if sov_idx > hardstop_idx else hardstop_idx
+            hardstop_rating = scale[hardstop_idx]
+            capped_rating = scale[capped_idx]
 
         final_rating = capped_rating  # currently no further adjustments
 
         # 6) Sovereign cap binding definition
-        sovereign_cap_binding = (
-            enable_sovereign_cap
-            and sovereign_rating is not None
-            and final_rating == sovereign_rating
-        )
+        if not cap_active:
+            sovereign_cap_binding = False
+        elif sov_idx >= 0:
+            sovereign_cap_binding = capped_idx == sov_idx
+        else:
+            sovereign_cap_binding = final_rating == sovereign_rating
+        capped_by_sovereign = capped_idx != hardstop_idx
 
         # 7) Outlook logic
         # 1) Band-based base outlook from score position within rating band
         base_outlook = derive_outlook_band_only(combined_score, base_rating)
 
-        # 2) Sovereign-binding branch
-        if (
-            sovereign_cap_binding
-            and sovereign_outlook in {"Positive", "Stable", "Negative"}
-        ):
-            # Special aligned case: issuer rating == sovereign rating and same outlook
-            # → keep model's band-based base_outlook
-            if (
-                hardstop_rating == capped_rating == sovereign_rating
-                and base_outlook == sovereign_outlook
-            ):
-                outlook = base_outlook
-            else:
-                # Sovereign-aligned outlook when issuer is capped at or below sovereign
-                if base_outlook == "Positive" and sovereign_outlook in {
-                    "Stable",
-                    "Negative",
-                }:
-                    # If model is more optimistic than the sovereign, sovereign dominates
-                    outlook = sovereign_outlook
-                elif base_outlook == "Negative" or sovereign_outlook == "Negative":
-                    # if either side is Negative, keep it conservative
-                    outlook = "Negative"
-                else:
-                    # Both sides non-Negative and not more optimistic than sovereign → Stable
-                    outlook = "Stable"
+        # 2) Sovereign-binding branch: table lookup; misses (cap not binding, or
+        # sovereign outlook not a valid outlook) fall through to 3)
+        outlook = _OUTLOOK_TABLE.get(
+            (base_outlook, sovereign_outlook, sovereign_cap_binding, not capped_by_sovereign)
+        )
         # 3) Non-binding / no-cap branch: distress-trend overlay
-        else:
+        if outlook is None:
             # No binding: add distress trend logic on top of base_outlook
             # and only adjust if a distress hardstop actually bit (distress_notches < 0)
             outlook = derive_outlook_with_distress_trend(
@@ -268,89 +573,32 @@ class RatingModel:
         if final_rating == "AAA" and outlook == "Positive":
             outlook = "Stable"
 
-        # 8) Flags always present
-        flags = {
-            "enable_hardstops": enable_hardstops,
-            "enable_sovereign_cap": enable_sovereign_cap and (sovereign_rating is not None),
-            "hardstop_triggered": hardstop_triggered,
-            "sovereign_cap_binding": sovereign_cap_binding,
-        }
-
-        # 9) Rating explanation (driven by flags and binding)
-        parts: List[str] = []
-
-        # Core model
-        parts.append(
-            f"Based on the quantitative and qualitative factors, the combined score is "
-            f"{combined_score:.1f}, corresponding to a base rating of {base_rating}."
-        )
-
-        # Distress / hardstops
-        if hardstop_triggered:
-            parts.append(
-                f" Distress factors {list(hardstop_details.keys())} triggered a total "
-                f"of {abs(distress_notches)} notch(es) of downgrade, resulting in a "
-                f"post-distress (hardstop) rating of {hardstop_rating}."
-            )
-        else:
-            parts.append(
-                f" No distress-related hardstops were applied, so the hardstop rating "
-                f"remains equal to the base rating at {hardstop_rating}."
-            )
-
-        # Sovereign cap
-        if enable_sovereign_cap and sovereign_rating is not None:
-            if sovereign_cap_binding:
-                if hardstop_rating != capped_rating:
-                    # sovereign actively worsens the rating relative to hardstop
-                    parts.append(
-                        f" The sovereign cap is binding: given the sovereign rating of "
-                        f"{sovereign_rating}, the rating is constrained from {hardstop_rating} "
-                        f"to a capped rating of {capped_rating}."
-                    )
-                else:
-                    # issuer is at sovereign level; cap is effectively binding at that level
-                    parts.append(
-                        f" The issuer's rating is aligned with the sovereign rating at "
-                        f"{sovereign_rating}, so the sovereign cap is effectively binding."
-                    )
-            else:
-                # cap present but not constraining
-                parts.append(
-                    f" A sovereign rating of {sovereign_rating} is considered, but it does not "
-                    f"constrain the issuer rating, so the capped rating remains {capped_rating}."
-                )
-        else:
-            # no cap applied
-            parts.append(
-                f" No sovereign cap is applied, so the capped rating is the same as the "
-                f"post-distress rating at {capped_rating}."
+        # 8) Flags always present; one shared read-only dict per combination
+        flags = _FLAGS[
+            bool(enable_hardstops),
+            bool(cap_active),
+            hardstop_triggered,
+            sovereign_cap_binding,
+        ]
+
+        if logger.isEnabledFor(_INFO):
+            logger.info(
+                "%s-Final: base=%s hardstop=%s capped=%s final=%s outlook=%s distress_notches=%d",
+                self.cp_name,
+                base_rating,
+                hardstop_rating,
+                capped_rating,
+                final_rating,
+                outlook,
+                distress_notches,
             )
 
-        # Final sentence
-        parts.append(
-            f" The final issuer rating is {final_rating} with an outlook of {outlook}."
-        )
-
-        rating_explanation = "".join(parts)
-
-        logging.info(
-            "%s-Final: base=%s hardstop=%s capped=%s final=%s outlook=%s distress_notches=%d",
-            self.cp_name,
-            base_rating,
-            hardstop_rating,
-            capped_rating,
-            final_rating,
-            outlook,
-            distress_notches,
-        )
-
-        return RatingOutputs(
+        outputs = RatingOutputs(
             issuer_name=self.cp_name,
             quantitative_score=quant_score,
             qualitative_score=qual_score,
             combined_score=combined_score,
-            peer_score=peer_score,
+            peer_score=quant_result.peer_score,
             base_rating=base_rating,
             distress_notches=distress_notches,
             hardstop_rating=hardstop_rating,
@@ -362,8 +610,62 @@ class RatingModel:
             sovereign_outlook=sovereign_outlook,
             sovereign_cap_binding=sovereign_cap_binding,
             outlook=outlook,
-            bucket_avgs=bucket_avgs,
+            bucket_avgs=quant_result.bucket_avgs,
             altman_z_t0=altman_z,
             flags=flags,
-            rating_explanation=rating_explanation,
+            rating_explanation=None,
         )
+        # 9) Rating explanation, skipped when the caller does not need it
+        if explain:
+            outputs.rating_explanation = explain_rating(outputs)
+        return outputs
+
+    def batch_compute(
+        self,
+        issuers: Iterable[IssuerInputs],
+        enable_hardstops: bool = False,
+        enable_sovereign_cap: bool = False,
+        max_workers: Optional[int] = None,
+        explain: bool = True,
+    ) -> List[RatingOutputs]:
+        """
+        Rate many issuers, split into one chunk per worker process.
+
+        Outputs are returned in input order and carry this model's cp_name.
+        max_workers defaults to os.cpu_count(); 1 rates in-process. Workers
+        use the config as it stands when the pool starts (fork) or as
+        imported (spawn), so tune config tables before calling. Each chunk
+        is rated with rate_many; explain=False skips the explanation text.
+        """
+        issuers = list(issuers)
+        workers = min(max_workers or os.cpu_count() or 1, len(issuers))
+        if workers <= 1:
+            return _rate_chunk(
+                self.cp_name, issuers, enable_hardstops, enable_sovereign_cap, explain
+            )
+
+        size = -(-len(issuers) // workers)  # ceil division
+        chunks = [issuers[i:i + size] for i in range(0, len(issuers), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                _rate_chunk,
+                repeat(self.cp_name),
+                chunks,
+                repeat(enable_hardstops),
+                repeat(enable_sovereign_cap),
+                repeat(explain),
+            )
+            return [out for chunk in results for out in chunk]
+
+
+def _rate_chunk(
+    cp_name: str,
+    issuers: List[IssuerInputs],
+    enable_hardstops: bool,
+    enable_sovereign_cap: bool,
+    explain: bool,
+) -> List[RatingOutputs]:
+    # module-level so it can be pickled into worker processes
+    return RatingModel(cp_name).rate_many(
+        issuers, enable_hardstops, enable_sovereign_cap, explain=explain
+    )
@@ -0,0 +1,39 @@
+# SN-Corporate-Rating-Model-V2/tests/conftest.py
+import copy
+
+import pytest
+
+from sn_rating_v2 import config
+
+# Containers the tests tune in place. Other modules hold references to these
+# objects, so they are restored in place rather than rebound.
+_TUNABLES = (
+    "RATIO_FAMILY",
+    "SCORE_TO_RATING",
+    "RATING_SCALE",
+    "RATING_WEIGHTS",
+    "DISTRESS_TRIGGERS",
+    "DISTRESS_BANDS",
+    "RATIO_GRIDS",
+    "QUAL_SCORE_SCALE",
+)
+_SCALARS = ("MAX_DISTRESS_NOTCHES", "DISTRESS_METRICS", "BUCKET_FAMILIES")
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Give every test the default config and undo whatever it changed."""
+    saved = {name: getattr(config, name) for name in _TUNABLES + _SCALARS}
+    # plain dict/list copies, so nested grids edited in place are restored too
+    contents = {name: copy.deepcopy(saved[name]) for name in _TUNABLES}
+    yield
+    for name, value in saved.items():
+        setattr(config, name, value)
+    for name, items in contents.items():
+        target = saved[name]
+        if isinstance(target, dict):
+            target.clear()
+            target.update(items)
+        else:
+            target[:] = items
+    config.refresh_tables()
@@ -0,0 +1,124 @@
+# SN-Corporate-Rating-Model-V2/tests/test_fastpath.py
+import math
+
+from sn_rating_v2.datamodel import QuantArrays, QuantInputs
+from sn_rating_v2.fastpath import (
+    altman_z_batch,
+    altman_z_columns_nb,
+    altman_z_nb,
+    batch_score,
+    batch_score_arrays,
+    flat_grids,
+    score_grid_nb,
+)
+from sn_rating_v2.config import ALTMAN_COMPONENTS
+from sn_rating_v2.helpers import (
+    compute_altman_z_batch,
+    compute_altman_z_from_components,
+    score_ratio,
+)
+
+
+def test_altman_z_nb_matches_helper():
+    z = altman_z_nb(100.0, 200.0, 50.0, 20.0, 300.0, 150.0, 400.0)
+    assert z == compute_altman_z_from_components(100.0, 200.0, 50.0, 20.0, 300.0, 150.0, 400.0)
+    assert math.isnan(altman_z_nb(1.0, 0.0, 1.0, 1.0, 1.0, 1.0, 1.0))
+
+
+def test_altman_z_columns_match_per_dict_batch():
+    from array import array
+
+    comps = [
+        dict(zip(ALTMAN_COMPONENTS, (100.0, 50.0, 20.0, 400.0, 300.0, 200.0, 150.0))),
+        dict(zip(ALTMAN_COMPONENTS, (-5.0, 10.0, 3.0, 90.0, 40.0, 80.0, 60.0))),
+        dict(zip(ALTMAN_COMPONENTS, (1.0, 1.0, 1.0, 1.0, 1.0, 0.0, 1.0))),  # ta == 0
+    ]
+    expected = compute_altman_z_batch(comps)
+    columns = [array("d", [c[k] for c in comps]) for k in ALTMAN_COMPONENTS]
+    out = array("d", [0.0]) * len(comps)
+    altman_z_columns_nb(*columns, out)
+    for got in (list(out), altman_z_batch(comps)):
+        assert got[:2] == expected[:2]
+        assert math.isnan(got[2]) and math.isnan(expected[2])
+    assert altman_z_batch([]) == []
+
+
+def test_score_grid_nb_matches_score_ratio():
+    names = ["debt_ebitda", "capex_dep"]
+    offsets, lows, highs, scores = flat_grids(names)
+    scored = 0
+    for r, name in enumerate(names):
+        for value in (-1.0, 0.5, 1.3, 2.0, 3.0, 10.0, float("nan")):
+            s = score_grid_nb(value, lows, highs, scores, offsets[r], offsets[r + 1])
+            expected = score_ratio(name, value)
+            if expected is None:
+                assert math.isnan(s)
+            else:
+                assert s == expected
+                scored += 1
+    assert scored >= 10  # only nan misses the default grids
+
+
+def test_batch_score_averages_scored_ratios():
+    fins = [
+        {"debt_ebitda": 1.0, "capex_dep": 1.3},  # 100, 100
+        {"debt_ebitda": 5.0, "roa": float("nan")},  # 25, unscored
+        {},
+    ]
+    avg, n = batch_score(fins, names=["debt_ebitda", "capex_dep", "roa"])
+    assert avg == [100.0, 25.0, 0.0]
+    assert n == [2, 1, 0]
+
+
+def test_quant_arrays_layout_and_batch_score_arrays():
+    q = QuantInputs(
+        fin_t0={"debt_ebitda": 1.0, "capex_dep": 1.3},
+        fin_t1={"debt_ebitda": 5.0},
+        fin_t2={},
+        components_t0={"total_assets": 200.0},
+        components_t1={},
+        components_t2={},
+        peers_t0={"debt_ebitda": [2.0, 4.0]},
+    )
+    a = QuantArrays.from_inputs(q)
+    j = a.names.index("debt_ebitda")
+    assert a.fin[0][j] == 1.0
+    assert a.fin[1][j] == 5.0
+    assert math.isnan(a.fin[2][j])
+    assert a.peer_means[j] == 3.0
+    assert math.isnan(a.peer_means[a.names.index("capex_dep")])
+    assert a.components[0][5] == 200.0  # total_assets column
+
+    assert batch_score_arrays([a, a]) == batch_score([q.fin_t0, q.fin_t0], names=a.names)
+    assert batch_score_arrays([a], period=1) == ([25.0], [1])
+
+
+def test_score_and_distress_matches_model():
+    from sn_rating_v2.fastpath import score_and_distress
+    from sn_rating_v2.model import RatingModel
+
+    q = QuantInputs(
+        fin_t0={
+            "debt_ebitda": 3.2,
+            "interest_coverage": 0.8,
+            "dscr": 0.95,
+            "capex_dep": 1.3,
+            "altman_z": 1.6,
+        },
+        fin_t1={},
+        fin_t2={},
+        components_t0={},
+        components_t1={},
+        components_t2={},
+        peers_t0={},
+    )
+    model = RatingModel(cp_name="FastpathTest")
+    quant_score, _, _, altman_z, n_quant = model.compute_quantitative(q)
+    notches, _ = model.compute_distress_notches(q.fin_t0, altman_z)
+    assert notches == -4  # capped
+
+    assert score_and_distress(QuantArrays.from_inputs(q), altman_z) == (
+        quant_score,
+        n_quant,
+        notches,
+    )
@@ -1,10 +1,16 @@
 # SN-Corporate-Rating-Model-V2/tests/test_helpers.py
 import math
 
+import pytest
+
 from sn_rating_v2.helpers import (
     score_ratio,
+    score_ratio_column,
+    score_ratios_batch,
     score_qual_factor_numeric,
     compute_altman_z_from_components,
+    compute_altman_z_batch,
+    compute_peer_means,
     compute_peer_score,
     score_to_rating,
     safe_score_to_rating,
@@ -14,8 +20,10 @@ from sn_rating_v2.helpers import (
     get_rating_band,
     derive_outlook_band_only,
     derive_outlook_with_distress_trend,
+    compute_peer_score_batch,
 )
 from sn_rating_v2 import config
+from sn_rating_v2.datamodel import QuantInputs
 
 
 def test_score_ratio_basic():
@@ -30,6 +38,70 @@ def test_score_ratio_basic():
     assert score_ratio("unknown_ratio", 0.5) is None
 
 
+def test_score_ratio_unsorted_grid_with_gap_and_in_place_update():
+    grid = [
+        (2.0, 3.0, 50.0),
+        (0.0, 1.0, 100.0),  # gap between 1.0 and 2.0
+        (3.0, float("inf"), 0.0),
+    ]
+    config.RATIO_GRIDS["test_ratio_gap"] = grid
+    assert score_ratio("test_ratio_gap", 0.0) == 100.0
+    assert score_ratio("test_ratio_gap", 1.5) is None
+    assert score_ratio("test_ratio_gap", 2.0) == 50.0
+    assert score_ratio("test_ratio_gap", 1e9) == 0.0
+    assert score_ratio("test_ratio_gap", -0.1) is None
+
+    # assigning a grid refreshes the tables; nested edits need refresh_tables()
+    config.RATIO_GRIDS["test_ratio_gap"] = grid + [(1.0, 2.0, 75.0)]
+    assert score_ratio("test_ratio_gap", 1.5) == 75.0
+    grid.append((1.0, 2.0, 60.0))
+    config.RATIO_GRIDS["test_ratio_gap"] = grid
+    config.RATIO_GRIDS["test_ratio_gap"].pop()
+    config.RATIO_GRIDS["test_ratio_gap"].append((1.0, 2.0, 65.0))
+    assert score_ratio("test_ratio_gap", 1.5) == 60.0
+    config.refresh_tables()
+    assert score_ratio("test_ratio_gap", 1.5) == 65.0
+
+
+def test_capex_dep_grid_is_contiguous_and_bisectable():
+    grid = config.RATIO_GRIDS["capex_dep"]
+    assert [low for low, _, _ in grid] == sorted(low for low, _, _ in grid)
+    for (_, high, _), (low, _, _) in zip(grid, grid[1:]):
+        assert high == low
+    lows, highs, scores = config.ratio_cuts("capex_dep")
+    assert scores == (0.0, 25.0, 50.0, 75.0, 100.0, 75.0, 50.0, 25.0)
+    assert score_ratio("capex_dep", 1.3) == 100.0
+    assert score_ratio("capex_dep", 3.5) == 25.0
+
+
+def test_score_ratios_batch_matches_score_ratio():
+    config.RATIO_GRIDS["test_ratio"] = [
+        (0.0, 1.0, 10.0),
+        (1.0, 2.0, 20.0),
+    ]
+    fin = {
+        "test_ratio": 1.5,
+        "debt_ebitda": 3.2,
+        "capex_dep": 1.3,
+        "roa": float("nan"),
+        "unknown_ratio": 0.5,
+    }
+    # sparse fins dispatch per ratio, dense ones run every grid inline
+    dense = {name: 1.1 for name in config.RATIO_GRIDS}
+    dense.update(fin, dscr=None)
+    for sample in (fin, dense):
+        scores = score_ratios_batch(sample)
+        assert list(scores) == list(sample)
+        for name, value in sample.items():
+            assert scores[name] == score_ratio(name, value)
+
+
+def test_score_ratio_column_matches_score_ratio():
+    values = [-1.0, 0.4, 1.3, 2.0, 3.6, float("nan"), None, float("inf")]
+    for name in ("capex_dep", "debt_ebitda", "unknown_ratio"):
+        assert score_ratio_column(name, values) == [score_ratio(name, v) for v in values]
+
+
 def test_score_qual_factor_numeric():
     config.QUAL_SCORE_SCALE.clear()
     config.QUAL_SCORE_SCALE.update({1: 20.0, 3: 60.0, 5: 100.0})
@@ -54,6 +126,43 @@ def test_compute_altman_z_from_components():
     assert z > 0
 
 
+def test_compute_altman_z_batch_matches_scalar():
+    components = [
+        {
+            "working_capital": 100.0,
+            "total_assets": 200.0,
+            "retained_earnings": 50.0,
+            "ebit": 20.0,
+            "market_value_equity": 300.0,
+            "total_liabilities": 150.0,
+            "sales": 400.0,
+        },
+        {
+            "working_capital": 120.0,
+            "total_assets": 1000.0,
+            "retained_earnings": 200.0,
+            "ebit": 80.0,
+            "market_value_equity": 600.0,
+            "total_liabilities": 400.0,
+            "sales": 900.0,
+        },
+        {
+            "working_capital": 1.0,
+            "total_assets": 0.0,
+            "retained_earnings": 1.0,
+            "ebit": 1.0,
+            "market_value_equity": 1.0,
+            "total_liabilities": 1.0,
+            "sales": 1.0,
+        },
+    ]
+    zs = compute_altman_z_batch(components)
+    assert len(zs) == 3
+    for c, z in zip(components[:2], zs[:2]):
+        assert z == compute_altman_z_from_components(**c)
+    assert math.isnan(zs[2])
+
+
 def test_compute_peer_score_tiers():
     fin_current = {"ratio1": 100.0, "ratio2": 100.0}
     peers = {
@@ -64,6 +173,39 @@ def test_compute_peer_score_tiers():
     assert score in {0.0, 25.0, 50.0, 75.0, 100.0}
 
 
+def test_compute_peer_score_share_ladder():
+    peers = {f"r{i}": [100.0, 100.0] for i in range(10)}
+
+    def score_with_under(n_under):
+        fin = {f"r{i}": (50.0 if i < n_under else 100.0) for i in range(10)}
+        return compute_peer_score(fin, peers)
+
+    assert score_with_under(0) == 100.0
+    assert score_with_under(1) == 100.0  # share 0.10 is inclusive
+    assert score_with_under(2) == 75.0
+    assert score_with_under(6) == 50.0
+    assert score_with_under(8) == 25.0
+    assert score_with_under(9) == 0.0
+    assert compute_peer_score({}, peers) is None
+
+
+def test_peer_means_cached_on_quant_inputs():
+    peers = {"ratio1": [1.0, 3.0], "ratio2": [], "ratio3": [4.0]}
+    q = QuantInputs(
+        fin_t0={"ratio1": 1.0, "ratio3": 4.0},
+        fin_t1={},
+        fin_t2={},
+        components_t0={},
+        components_t1={},
+        components_t2={},
+        peers_t0=peers,
+    )
+    assert q.peer_means == compute_peer_means(peers) == {"ratio1": 2.0, "ratio3": 4.0}
+    assert compute_peer_score(q.fin_t0, peers, q.peer_means) == compute_peer_score(
+        q.fin_t0, peers
+    )
+
+
 def test_score_to_rating_and_safe_score_to_rating():
     config.SCORE_TO_RATING.clear()
     config.SCORE_TO_RATING.extend([
@@ -99,6 +241,24 @@ def test_compute_effective_weights_auto_and_manual():
     assert (wq2, wl2) == (0.7, 0.3)
 
 
+def test_compute_effective_weights_memoised_per_config():
+    from sn_rating_v2.helpers import _effective_weights
+
+    config.RATING_WEIGHTS["quantitative"] = None
+    config.RATING_WEIGHTS["qualitative"] = None
+    _effective_weights.cache_clear()
+    for _ in range(5):
+        assert compute_effective_weights(6, 2) == (0.75, 0.25)
+    assert _effective_weights.cache_info().hits == 4
+    config.RATING_WEIGHTS["quantitative"] = 0.6
+    config.RATING_WEIGHTS["qualitative"] = 0.4
+    try:
+        assert compute_effective_weights(6, 2) == (0.6, 0.4)
+    finally:
+        config.RATING_WEIGHTS["quantitative"] = None
+        config.RATING_WEIGHTS["qualitative"] = None
+
+
 def test_get_rating_band_and_outlook_band_only():
     config.SCORE_TO_RATING.clear()
     config.SCORE_TO_RATING.extend([
@@ -114,6 +274,22 @@ def test_get_rating_band_and_outlook_band_only():
     assert derive_outlook_band_only(70.0, "BBB") == "Stable"
 
 
+def test_outlook_band_only_edges_and_unknown_grade():
+    config.SCORE_TO_RATING.clear()
+    config.SCORE_TO_RATING.extend([
+        (80.0, "A"),
+        (79.0, "BBB"),  # single-point band: band_min == band_max
+        (60.5, "BB"),  # fractional cutoff: band_max 78.0, band_min never floored
+        (0.0, "B"),
+    ])
+    assert derive_outlook_band_only(79.5, "BBB") == "Positive"
+    assert derive_outlook_band_only(78.99, "BB") == "Positive"
+    assert derive_outlook_band_only(60.7, "BB") == "Stable"
+    assert derive_outlook_band_only(100.0, "A") == "Positive"
+    with pytest.raises(ValueError):
+        derive_outlook_band_only(50.0, "ZZZ")
+
+
 def test_derive_outlook_with_distress_trend():
     base_outlook = "Stable"
     distress_notches = -2
@@ -130,3 +306,82 @@ def test_derive_outlook_with_distress_trend():
         base_outlook, 0, fin_t0, fin_t1
     )
     assert outlook2 == base_outlook
+
+
+def test_derive_outlook_with_distress_trend_directions():
+    fin_t1 = {"interest_coverage": 2.0, "dscr": 1.5, "altman_z": 2.0}
+    worse = {"interest_coverage": 1.0, "dscr": 1.0, "altman_z": float("nan")}
+    mixed = {"interest_coverage": 3.0, "dscr": 1.0}
+    flat = {"interest_coverage": 2.0}
+    assert derive_outlook_with_distress_trend("Positive", -1, worse, fin_t1) == "Negative"
+    assert derive_outlook_with_distress_trend("Positive", -1, mixed, fin_t1) == "Stable"
+    assert derive_outlook_with_distress_trend("Positive", -1, flat, fin_t1) == "Stable"
+    assert derive_outlook_with_distress_trend("Positive", -1, {}, fin_t1) == "Stable"
+
+
+def test_ratio_slots_follow_family_index_and_config_changes():
+    slots = config.ratio_slots()
+    index = config.family_index()
+    assert list(index)[: len(config.BUCKET_FAMILIES)] == list(config.BUCKET_FAMILIES)
+    assert slots == {r: index[f] for r, f in config.RATIO_FAMILY.items()}
+    config.RATIO_FAMILY["tmp_ratio"] = "tmp_family"
+    try:
+        assert config.ratio_slots()["tmp_ratio"] == config.family_index()["tmp_family"]
+    finally:
+        del config.RATIO_FAMILY["tmp_ratio"]
+    assert "tmp_ratio" not in config.ratio_slots()
+
+
+def test_compute_peer_score_batch_matches_per_issuer():
+    peers = {"roa": [0.04, 0.06], "dscr": [1.0, 2.0], "zero": [0.0]}
+    means = compute_peer_means(peers)
+    fins = [
+        {"roa": 0.01, "dscr": 0.5},
+        {"roa": 0.05, "dscr": 1.4},
+        {"roa": 0.01, "dscr": 1.6, "zero": -1.0},
+        {"other": 1.0},
+        {},
+    ]
+    expected = [compute_peer_score(fin, peers) for fin in fins]
+    assert compute_peer_score_batch(fins, means) == expected
+    assert expected[3] is None and expected[4] is None
+    assert compute_peer_score_batch([], means) == []
+
+
+def test_config_tables_rebuild_on_in_place_edits_only():
+    import copy
+    import pickle
+
+    grid = ((float("-inf"), 1.0, 10.0), (1.0, float("inf"), 90.0))
+    config.RATIO_GRIDS["tmp_ratio"] = grid
+    try:
+        lows, highs, scores = config.ratio_cuts("tmp_ratio")
+        assert (lows, highs, scores) == ((float("-inf"), 1.0), (1.0, float("inf")), (10.0, 90.0))
+        detached = copy.copy(config.RATIO_GRIDS)
+        assert type(detached) is dict
+        assert type(pickle.loads(pickle.dumps(config.RATING_SCALE))) is list
+        detached["tmp_ratio"] = grid[:1]  # a copy does not touch the tables
+        assert score_ratio("tmp_ratio", 2.0) == 90.0
+    finally:
+        del config.RATIO_GRIDS["tmp_ratio"]
+    assert config.ratio_cuts("tmp_ratio") is None
+    assert score_ratio("tmp_ratio", 2.0) is None
+
+
+def test_rebound_rating_scale_is_used_only_after_refresh():
+    original = config.RATING_SCALE
+    saved = list(original)
+    original[:] = ["A", "B", "B-", "C"]
+    config.RATING_SCALE = ["A", "B", "C"]
+    try:
+        # until the tables are rebuilt, scale and index both stay on the old list
+        assert move_notches("B", -1) == "B-"
+        assert apply_sovereign_cap("A", "C") == "C"
+        config.refresh_tables()
+        assert move_notches("B", -1) == "C"
+        assert move_notches("A", 5) == "A"
+        assert apply_sovereign_cap("A", "B") == "B"
+    finally:
+        config.RATING_SCALE = original
+        original[:] = saved
+    assert move_notches(saved[0], -1) == saved[1]
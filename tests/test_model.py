@@ -181,3 +181,356 @@ def test_compute_final_rating_with_sovereign_cap_binding():
     assert out.sovereign_cap_binding in {True, False}
     if out.sovereign_cap_binding:
         assert out.final_rating == sovereign_rating
+
+
+def _sample_issuers():
+    components = {
+        "working_capital": 100.0,
+        "total_assets": 200.0,
+        "retained_earnings": 50.0,
+        "ebit": 20.0,
+        "market_value_equity": 300.0,
+        "total_liabilities": 150.0,
+        "sales": 400.0,
+    }
+    issuers = []
+    for ic, dscr, sov in [(0.6, 0.9, "A"), (3.0, 1.2, None), (6.0, 2.0, "AA"), (1.5, 0.7, "BBB")]:
+        quant = QuantInputs(
+            fin_t0={"interest_coverage": ic, "dscr": dscr, "lt_debt_to_ebitda": 2.5},
+            fin_t1={"interest_coverage": ic + 0.5, "dscr": dscr, "lt_debt_to_ebitda": 2.8},
+            fin_t2={},
+            components_t0=dict(components),
+            components_t1={},
+            components_t2={},
+            peers_t0={"interest_coverage": [2.0, 2.5, 3.0]},
+        )
+        qual = QualInputs(factors_t0={"management_quality": 4, "governance": 2}, factors_t1={})
+        issuers.append((quant, qual, sov, "Stable" if sov else None))
+    return issuers
+
+
+def test_batch_compute_matches_single_issuer_path():
+    _setup_simple_config()
+    issuers = _sample_issuers()
+    model = RatingModel(cp_name="Portfolio")
+    expected = [
+        model.compute_final_rating(
+            q, ql, sovereign_rating=sr, sovereign_outlook=so,
+            enable_hardstops=True, enable_sovereign_cap=True,
+        )
+        for q, ql, sr, so in issuers
+    ]
+    for workers in (1, 2):
+        outs = model.batch_compute(
+            issuers, enable_hardstops=True, enable_sovereign_cap=True, max_workers=workers
+        )
+        assert outs == expected
+    assert model.batch_compute([]) == []
+
+
+def test_compute_quantitative_batch_matches_per_issuer():
+    _setup_simple_config()
+    quants = [q for q, _, _, _ in _sample_issuers()]
+    quants[1].fin_t0["altman_z"] = 2.0  # given, not computed from components
+    quants[2].fin_t0["unmapped_ratio"] = 1.0
+    model = RatingModel(cp_name="Portfolio")
+    before = [dict(q.fin_t0) for q in quants]
+    assert model.compute_quantitative_batch(quants) == [
+        model.compute_quantitative(q) for q in quants
+    ]
+    assert [q.fin_t0 for q in quants] == before
+
+
+def test_compute_quantitative_scores_computed_altman_z_without_mutating_inputs():
+    _setup_simple_config()
+    config.RATIO_FAMILY["altman_z"] = "altman"
+    config.RATIO_GRIDS["altman_z"] = [(float("-inf"), 1.8, 0.0), (1.8, float("inf"), 100.0)]
+    components = {
+        "working_capital": 100.0,
+        "total_assets": 200.0,
+        "retained_earnings": 50.0,
+        "ebit": 20.0,
+        "market_value_equity": 300.0,
+        "total_liabilities": 150.0,
+        "sales": 400.0,
+    }
+    model = RatingModel(cp_name="AltmanTest")
+    for fin_t0 in ({"dscr": 2.0}, {"altman_z": None, "dscr": 2.0}):
+        snapshot = dict(fin_t0)
+        quant = QuantInputs(
+            fin_t0=fin_t0,
+            fin_t1={},
+            fin_t2={},
+            components_t0=components,
+            components_t1={},
+            components_t2={},
+            peers_t0={"altman_z": [1.0, 1.0], "dscr": [1.0]},
+        )
+        score, peer, buckets, z, n = model.compute_quantitative(quant)
+        assert fin_t0 == snapshot
+        assert z > 1.8
+        assert buckets["altman"] == 100.0
+        assert n == 3  # dscr, altman_z, peer positioning
+        assert peer == 100.0
+        assert model.compute_quantitative_batch([quant]) == [(score, peer, buckets, z, n)]
+
+
+def test_compute_final_rating_notching_matches_grade_helpers():
+    from sn_rating_v2.helpers import apply_sovereign_cap, move_notches
+
+    _setup_simple_config()
+    model = RatingModel(cp_name="NotchTest")
+    for q, ql, sr, so in _sample_issuers():
+        out = model.compute_final_rating(
+            q, ql, sovereign_rating=sr, sovereign_outlook=so,
+            enable_hardstops=True, enable_sovereign_cap=True,
+        )
+        expected = move_notches(out.base_rating, out.distress_notches)
+        if sr is not None:
+            expected = apply_sovereign_cap(expected, sr)
+        assert out.final_rating == expected
+        assert out.sovereign_cap_binding == (sr is not None and expected == sr)
+
+
+def test_compute_final_rating_explain_false_defers_explanation():
+    from sn_rating_v2.model import explain_rating
+
+    _setup_simple_config()
+    model = RatingModel(cp_name="LazyTest")
+    for q, ql, sr, so in _sample_issuers():
+        kwargs = dict(
+            sovereign_rating=sr, sovereign_outlook=so,
+            enable_hardstops=True, enable_sovereign_cap=True,
+        )
+        full = model.compute_final_rating(q, ql, **kwargs)
+        lazy = model.compute_final_rating(q, ql, explain=False, **kwargs)
+        assert lazy.rating_explanation is None
+        assert explain_rating(lazy) == full.rating_explanation
+        lazy.rating_explanation = full.rating_explanation
+        assert lazy == full
+
+
+def test_rate_many_matches_compute_final_rating():
+    _setup_simple_config()
+    issuers = _sample_issuers()
+    model = RatingModel(cp_name="Portfolio")
+    expected = [
+        model.compute_final_rating(
+            q, ql, sovereign_rating=sr, sovereign_outlook=so,
+            enable_hardstops=True, enable_sovereign_cap=True,
+        )
+        for q, ql, sr, so in issuers
+    ]
+    outs = model.rate_many(issuers, enable_hardstops=True, enable_sovereign_cap=True)
+    assert [o.rating_explanation for o in outs] == [None] * len(issuers)
+    for out, exp in zip(outs, expected):
+        out.rating_explanation = exp.rating_explanation
+    assert outs == expected
+    assert model.rate_many(
+        issuers, enable_hardstops=True, enable_sovereign_cap=True, explain=True
+    ) == expected
+
+
+def test_compute_quantitative_and_qualitative_return_named_results():
+    from sn_rating_v2.datamodel import QualResult, QuantResult
+
+    _setup_simple_config()
+    quant, qual, _, _ = _sample_issuers()[0]
+    model = RatingModel(cp_name="ResultTest")
+    qres = model.compute_quantitative(quant)
+    lres = model.compute_qualitative(qual)
+    assert isinstance(qres, QuantResult) and isinstance(lres, QualResult)
+    score, peer, buckets, z, n = qres
+    assert (qres.quant_score, qres.peer_score, qres.bucket_avgs) == (score, peer, buckets)
+    assert (qres.altman_z, qres.n_quant) == (z, n)
+    assert tuple(lres) == (lres.qual_score, lres.n_qual)
+
+
+def test_bucket_avgs_report_extra_families_only_when_scored():
+    _setup_simple_config()
+    config.RATIO_FAMILY["liquidity_ratio"] = "liquidity"
+    config.RATIO_GRIDS["liquidity_ratio"] = [(0.0, 1.0, 30.0), (1.0, 999.0, 80.0)]
+    quant, _, _, _ = _sample_issuers()[0]
+    model = RatingModel(cp_name="BucketTest")
+    buckets = model.compute_quantitative(quant).bucket_avgs
+    assert list(buckets) == list(config.BUCKET_FAMILIES)
+    quant.fin_t0["liquidity_ratio"] = 0.5
+    buckets = model.compute_quantitative(quant).bucket_avgs
+    assert list(buckets) == list(config.BUCKET_FAMILIES) + ["liquidity"]
+    assert buckets["liquidity"] == 30.0
+
+
+def test_compute_distress_notches_band_edges_and_band_edits():
+    model = RatingModel(cp_name="DistressTest")
+    # defaults: first band with value < threshold, total floored at -4
+    fin = {"interest_coverage": 0.8, "dscr": 0.95}
+    assert model.compute_distress_notches(fin, 2.0) == (-3, fin)  # -2 at the 0.8 edge, -1
+    assert model.compute_distress_notches(fin, 1.0) == (-4, dict(fin, altman_z=1.0))
+    assert model.compute_distress_notches({"dscr": 0.85}, 1.81) == (-2, {"dscr": 0.85})
+    assert model.compute_distress_notches({}, float("nan")) == (0, {})
+
+    config.DISTRESS_BANDS["dscr"] = ((0.9, -1),)
+    del config.DISTRESS_BANDS["altman_z"]
+    assert model.compute_distress_notches({"dscr": 0.85}, 1.0) == (-1, {"dscr": 0.85})
+
+
+def test_outlook_merge_table_matches_binding_rules():
+    from sn_rating_v2.model import _OUTLOOK_MERGE, _VALID_OUTLOOKS
+
+    def merge(base, sov):
+        if base == "Positive" and sov in {"Stable", "Negative"}:
+            return sov
+        if base == "Negative" or sov == "Negative":
+            return "Negative"
+        return "Stable"
+
+    pairs = [(b, s) for b in _VALID_OUTLOOKS for s in _VALID_OUTLOOKS]
+    assert sorted(_OUTLOOK_MERGE) == sorted(pairs)
+    for base, sov in pairs:
+        assert _OUTLOOK_MERGE[base, sov] == merge(base, sov)
+
+
+def test_rating_outputs_use_slots():
+    _setup_simple_config()
+    quant, qual, _, _ = _sample_issuers()[0]
+    out = RatingModel(cp_name="SlotsTest").rate_many([(quant, qual, None, None)])[0]
+    assert not hasattr(out, "__dict__")
+    assert "final_rating" in type(out).__slots__
+
+
+def test_flags_are_shared_read_only_and_picklable():
+    import pickle
+
+    import pytest
+
+    _setup_simple_config()
+    issuers = _sample_issuers()
+    model = RatingModel(cp_name="FlagsTest")
+    a, b = model.rate_many(issuers[:2])
+    assert a.flags is b.flags
+    assert a.flags == {
+        "enable_hardstops": False,
+        "enable_sovereign_cap": False,
+        "hardstop_triggered": False,
+        "sovereign_cap_binding": False,
+    }
+    with pytest.raises(TypeError):
+        a.flags["hardstop_triggered"] = True
+    with pytest.raises(TypeError):
+        a.flags.update(hardstop_triggered=True)
+    assert b.flags["hardstop_triggered"] is False
+    assert pickle.loads(pickle.dumps(a)) == a
+    assert dict(a.flags) == a.flags
+
+
+def test_outlook_table_covers_every_binding_case():
+    from sn_rating_v2.model import _OUTLOOK_TABLE
+
+    P, S, N = "Positive", "Stable", "Negative"
+    # (base_outlook, sovereign_outlook, binding, aligned) → outlook
+    assert _OUTLOOK_TABLE == {
+        (P, P, True, False): S,
+        (P, P, True, True): P,
+        (P, S, True, False): S,
+        (P, S, True, True): S,
+        (P, N, True, False): N,
+        (P, N, True, True): N,
+        (S, P, True, False): S,
+        (S, P, True, True): S,
+        (S, S, True, False): S,
+        (S, S, True, True): S,
+        (S, N, True, False): N,
+        (S, N, True, True): N,
+        (N, P, True, False): N,
+        (N, P, True, True): N,
+        (N, S, True, False): N,
+        (N, S, True, True): N,
+        (N, N, True, False): N,
+        (N, N, True, True): N,
+    }
+
+
+def _cascade_outlook(out, quant, enable_sovereign_cap):
+    # the original branch cascade of compute_final_rating, step 7
+    from sn_rating_v2.helpers import (
+        derive_outlook_band_only,
+        derive_outlook_with_distress_trend,
+    )
+
+    base_outlook = derive_outlook_band_only(out.combined_score, out.base_rating)
+    sov, sov_outlook = out.sovereign_rating, out.sovereign_outlook
+    binding = enable_sovereign_cap and sov is not None and out.final_rating == sov
+    if binding and sov_outlook in {"Positive", "Stable", "Negative"}:
+        if out.hardstop_rating == out.capped_rating == sov and base_outlook == sov_outlook:
+            outlook = base_outlook
+        elif base_outlook == "Positive" and sov_outlook in {"Stable", "Negative"}:
+            outlook = sov_outlook
+        elif base_outlook == "Negative" or sov_outlook == "Negative":
+            outlook = "Negative"
+        else:
+            outlook = "Stable"
+    else:
+        outlook = derive_outlook_with_distress_trend(
+            base_outlook, out.distress_notches, quant.fin_t0, quant.fin_t1
+        )
+    if out.final_rating == "AAA" and outlook == "Positive":
+        outlook = "Stable"
+    return outlook, binding, base_outlook
+
+
+def test_final_outlook_matches_original_cascade_on_random_issuers():
+    import random
+
+    rng = random.Random(3000)
+    model = RatingModel(cp_name="CascadeTest")
+    names = list(config.RATIO_GRIDS)
+    grades = list(config.RATING_SCALE)
+    outlooks = ("Positive", "Stable", "Negative", "Watch", None)
+    binding_cases = set()
+    for _ in range(3000):
+        fin_t0 = {n: rng.uniform(-1.0, 12.0) for n in rng.sample(names, rng.randint(1, len(names)))}
+        fin_t1 = {n: v + rng.uniform(-1.0, 1.0) for n, v in fin_t0.items()}
+        components = {
+            "working_capital": rng.uniform(-50.0, 200.0),
+            "total_assets": rng.uniform(50.0, 1000.0),
+            "retained_earnings": rng.uniform(-100.0, 300.0),
+            "ebit": rng.uniform(-50.0, 150.0),
+            "market_value_equity": rng.uniform(0.0, 900.0),
+            "total_liabilities": rng.uniform(50.0, 800.0),
+            "sales": rng.uniform(0.0, 1200.0),
+        }
+        quant = QuantInputs(fin_t0, fin_t1, {}, components, {}, {}, {})
+        qual = QualInputs({f"f{j}": rng.randint(1, 5) for j in range(rng.randint(0, 4))}, {})
+        enable_cap = rng.random() < 0.8
+        out = model.compute_final_rating(
+            quant, qual,
+            sovereign_rating=rng.choice(grades + [None]),
+            sovereign_outlook=rng.choice(outlooks),
+            enable_hardstops=rng.random() < 0.7,
+            enable_sovereign_cap=enable_cap,
+        )
+        outlook, binding, base_outlook = _cascade_outlook(out, quant, enable_cap)
+        assert out.outlook == outlook
+        assert out.sovereign_cap_binding == binding
+        if binding and out.sovereign_outlook in {"Positive", "Stable", "Negative"}:
+            aligned = out.hardstop_rating == out.capped_rating
+            binding_cases.add((base_outlook, out.sovereign_outlook, aligned))
+    assert len(binding_cases) == 18  # every _OUTLOOK_TABLE entry was exercised
+
+
+def test_final_outlook_binding_cases_and_sovereign_fallback():
+    _setup_simple_config()
+    model = RatingModel(cp_name="OutlookTest")
+    for quant, qual, sov, _ in _sample_issuers():
+        if sov is None:
+            continue
+        for sov_outlook in ("Positive", "Stable", "Negative", "Watch"):
+            out = model.compute_final_rating(
+                quant, qual, sovereign_rating=sov, sovereign_outlook=sov_outlook,
+                enable_hardstops=True, enable_sovereign_cap=True,
+            )
+            assert out.outlook in {"Positive", "Stable", "Negative"}
+            if out.sovereign_cap_binding and sov_outlook == "Negative":
+                assert out.outlook == "Negative"
+            if out.final_rating == "AAA":
+                assert out.outlook != "Positive"